@@ -0,0 +1,141 @@
+"""
+Month-partitioned archive for AuditLog rows moved out by `manage.py archive_audit_logs`.
+
+Each month is a gzip-compressed JSONL file (audit-YYYY-MM.jsonl.gz) under
+AUDIT_LOG_ARCHIVE_DIR. index.json records every partition's row count and
+first/last timestamp, so a date range only opens the partitions it overlaps.
+Rows within a partition are in (timestamp, id) order.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+INDEX_FILE = 'index.json'
+
+
+def archive_dir():
+    return str(getattr(settings, 'AUDIT_LOG_ARCHIVE_DIR', settings.BASE_DIR / 'archive' / 'audit_logs'))
+
+
+def load_index():
+    path = os.path.join(archive_dir(), INDEX_FILE)
+    if not os.path.exists(path):
+        return {'partitions': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_index(index):
+    path = os.path.join(archive_dir(), INDEX_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)  # Readers never see a half-written index
+
+
+def _scan_partition(path):
+    """ids and first/last timestamp of the rows already in a partition file."""
+    ids, first, last = set(), None, None
+    if os.path.exists(path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                ids.add(row['id'])
+                first = min(filter(None, [first, row['timestamp']]))
+                last = max(filter(None, [last, row['timestamp']]))
+    return ids, first, last
+
+
+def append_rows(rows, archived_ids=None):
+    """
+    Appends serialized rows (dicts with an ISO 'timestamp') to their month partitions
+    and updates the index. Each call adds one gzip member per touched partition.
+
+    Rows whose id is already in their partition are skipped, so archiving a batch
+    again after a crash before its DELETE committed doesn't duplicate it.
+    archived_ids maps month -> archived ids and is filled from the partition file
+    the first time a month is touched; pass the same dict for every batch of a run
+    so each file is read once. Returns the number of rows written.
+    """
+    os.makedirs(archive_dir(), exist_ok=True)
+    index = load_index()
+    if archived_ids is None:
+        archived_ids = {}
+
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(row['timestamp'][:7], []).append(row)
+
+    written = 0
+    for month, month_rows in by_month.items():
+        filename = f'audit-{month}.jsonl.gz'
+        path = os.path.join(archive_dir(), filename)
+        if month not in archived_ids:
+            ids, first, last = _scan_partition(path)
+            archived_ids[month] = ids
+            # The file is the source of truth: a crash may have left the index behind it
+            if ids:
+                index['partitions'][month] = {'file': filename, 'rows': len(ids), 'first': first, 'last': last}
+            else:
+                index['partitions'].pop(month, None)
+
+        seen = archived_ids[month]
+        month_rows = [row for row in month_rows if row['id'] not in seen]
+        if not month_rows:
+            continue
+        with gzip.open(path, 'at', encoding='utf-8') as f:
+            for row in month_rows:
+                f.write(json.dumps(row) + '\n')
+        seen.update(row['id'] for row in month_rows)
+        written += len(month_rows)
+
+        entry = index['partitions'].setdefault(month, {'file': filename, 'rows': 0, 'first': None, 'last': None})
+        entry['rows'] += len(month_rows)
+        first, last = month_rows[0]['timestamp'], month_rows[-1]['timestamp']
+        entry['first'] = min(filter(None, [entry['first'], first]))
+        entry['last'] = max(filter(None, [entry['last'], last]))
+
+    save_index(index)
+    return written
+
+
+def iter_rows(start=None, end=None, action=None, user=None, target_model=None, target_id=None):
+    """
+    Yields archived rows (dicts) in chronological order.
+    start/end: aware datetimes, end exclusive. Other filters are exact matches
+    (user against the actor's username).
+    """
+    index = load_index()
+    # Archived timestamps are UTC ISO strings, which sort chronologically
+    start_iso = start.astimezone(timezone.utc).isoformat() if start else None
+    end_iso = end.astimezone(timezone.utc).isoformat() if end else None
+
+    for month in sorted(index['partitions']):
+        entry = index['partitions'][month]
+        # Skip partitions that cannot overlap the requested range
+        if start_iso and entry['last'] < start_iso:
+            continue
+        if end_iso and entry['first'] >= end_iso:
+            continue
+
+        with gzip.open(os.path.join(archive_dir(), entry['file']), 'rt', encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                if start and datetime.fromisoformat(row['timestamp']) < start:
+                    continue
+                if end and datetime.fromisoformat(row['timestamp']) >= end:
+                    continue
+                if action and row['action'] != action:
+                    continue
+                if user and row['actor_username'] != user:
+                    continue
+                if target_model and row['target_model'] != target_model:
+                    continue
+                if target_id and row['target_id'] != target_id:
+                    continue
+                yield row
@@ -0,0 +1,83 @@
+"""
+Buffered writer for AuditLog.
+
+Inside a request (accounts.middleware.AuditLogBufferMiddleware) entries are
+collected and written with a single bulk_create when the request ends. Outside
+a request (management commands, shell) they go to a per-process buffer that is
+flushed when it reaches AUDIT_LOG_BUFFER_SIZE entries, when
+AUDIT_LOG_FLUSH_INTERVAL seconds have passed, and at process exit.
+
+Set AUDIT_LOG_SYNC = True to write every entry immediately (used by tests).
+"""
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .models import AuditLog
+
+_request_buffer = ContextVar('audit_request_buffer', default=None)
+
+_process_buffer = []
+_process_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _sync_mode():
+    return getattr(settings, 'AUDIT_LOG_SYNC', False)
+
+
+def _write(entries):
+    if entries:
+        AuditLog.objects.bulk_create(entries)
+
+
+def record(**fields):
+    """Queues an AuditLog entry. Timestamps are taken now, not at flush time."""
+    entry = AuditLog(**fields)
+    if _sync_mode():
+        entry.save()
+        return
+
+    buffer = _request_buffer.get()
+    if buffer is not None:
+        buffer.append(entry)
+        return
+
+    global _last_flush
+    with _process_lock:
+        _process_buffer.append(entry)
+        due = (
+            len(_process_buffer) >= getattr(settings, 'AUDIT_LOG_BUFFER_SIZE', 100)
+            or time.monotonic() - _last_flush >= getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 5)
+        )
+    if due:
+        flush_process_buffer()
+
+
+def flush_process_buffer():
+    """Writes everything in the per-process buffer."""
+    global _last_flush
+    with _process_lock:
+        entries = _process_buffer[:]
+        _process_buffer.clear()
+        _last_flush = time.monotonic()
+    _write(entries)
+
+
+@contextmanager
+def buffered():
+    """Collects entries recorded inside the block and writes them in one statement on exit."""
+    buffer = []
+    token = _request_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _request_buffer.reset(token)
+        _write(buffer)
+
+
+atexit.register(flush_process_buffer)
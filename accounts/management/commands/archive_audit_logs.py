@@ -0,0 +1,63 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts import archive
+from accounts.models import AuditLog
+
+
+class Command(BaseCommand):
+    help = "Move AuditLog rows older than the retention window into compressed monthly archive files."
+
+    columns = ('id', 'timestamp', 'actor_id', 'actor__username', 'actor__role', 'action', 'target_model', 'target_id', 'details', 'ip_address')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'AUDIT_LOG_RETENTION_DAYS', 90),
+                            help="Keep this many days of audit log in the database.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many rows would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        old_logs = AuditLog.objects.filter(timestamp__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{old_logs.count()} audit log rows older than {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        total = 0
+        archived_ids = {}
+        while True:
+            # Oldest first, so each partition file stays in (timestamp, id) order
+            batch = list(old_logs.order_by('timestamp', 'id').values_list(*self.columns)[:options['batch_size']])
+            if not batch:
+                break
+
+            # Rows are only deleted once their partition files and the index are on disk.
+            # If the delete never commits, the next run finds them archived and skips them.
+            archive.append_rows([self.serialize(row) for row in batch], archived_ids)
+            with transaction.atomic():
+                AuditLog.objects.filter(pk__in=[row[0] for row in batch]).delete()
+
+            total += len(batch)
+            self.stdout.write(f"Archived {total} rows...")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} audit log rows older than {cutoff:%Y-%m-%d} to {archive.archive_dir()}."))
+
+    def serialize(self, row):
+        pk, timestamp, actor_id, username, role, action, target_model, target_id, details, ip = row
+        return {
+            'id': pk,
+            'timestamp': timestamp.astimezone(dt_timezone.utc).isoformat(),
+            'actor_id': actor_id,
+            'actor_username': username,
+            'actor_role': role,
+            'action': action,
+            'target_model': target_model,
+            'target_id': target_id,
+            'details': details,
+            'ip_address': ip,
+        }
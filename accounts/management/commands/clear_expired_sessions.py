@@ -0,0 +1,46 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions in small batches (unlike clearsessions' single DELETE, which holds the SQLite write lock throughout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.1, help="Seconds to wait between batches so requests can write.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many sessions would be deleted.")
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        store = engine.SessionStore
+        if not hasattr(store, 'get_model_class'):
+            # Cache-only sessions expire on their own
+            store.clear_expired()
+            self.stdout.write(self.style.SUCCESS(f"{settings.SESSION_ENGINE} expires sessions itself; nothing to delete."))
+            return
+
+        Session = store.get_model_class()
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} expired sessions would be deleted.")
+            return
+
+        total = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            # cached_db caches a session only until its expire_date, so no cache entry outlives its row
+            Session.objects.filter(session_key__in=keys).delete()
+            total += len(keys)
+            self.stdout.write(f"Deleted {total} sessions...")
+            if len(keys) < options['batch_size']:
+                break
+            time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} expired sessions."))
@@ -0,0 +1,103 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued EmailOutbox messages in batches over one reused SMTP connection."
+
+    # Messages left in SENDING longer than this (crashed worker) are picked up again
+    stale_after = timedelta(minutes=10)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--max-attempts', type=int, default=5, help="Attempts before a message is dead-lettered.")
+        parser.add_argument('--backoff', type=int, default=60, help="Base retry delay in seconds; doubles per attempt.")
+        parser.add_argument('--interval', type=float, default=10, help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument('--once', action='store_true', help="Drain the outbox and exit (for cron / scheduled tasks).")
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.max_attempts = options['max_attempts']
+        self.backoff = options['backoff']
+
+        smtp = get_connection(fail_silently=False)
+        try:
+            while True:
+                batch = self.claim_batch()
+                if batch:
+                    self.deliver(smtp, batch)
+                    continue
+                if options['once']:
+                    break
+                smtp.close()  # Don't hold the SMTP session open while idle
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            smtp.close()
+
+    def claim_batch(self):
+        """Marks up to batch_size due messages as SENDING and returns them."""
+        now = timezone.now()
+        EmailOutbox.objects.filter(
+            status=EmailOutbox.Status.SENDING, locked_at__lt=now - self.stale_after
+        ).update(status=EmailOutbox.Status.PENDING)
+
+        with transaction.atomic():
+            due = EmailOutbox.objects.filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now).order_by('id')
+            if connection.features.has_select_for_update_skip_locked:
+                # Lets several workers share the outbox without double-sending
+                due = due.select_for_update(skip_locked=True)
+            batch = list(due[:self.batch_size])
+            EmailOutbox.objects.filter(pk__in=[m.pk for m in batch]).update(status=EmailOutbox.Status.SENDING, locked_at=now)
+        return batch
+
+    def deliver(self, smtp, batch):
+        sent = failed = 0
+        for message in batch:
+            email = EmailMultiAlternatives(message.subject, message.body, message.from_email, message.recipients, connection=smtp)
+            if message.html_body:
+                email.attach_alternative(message.html_body, 'text/html')
+            try:
+                smtp.open()  # No-op while the connection is up; reconnects after a failure
+                email.send()
+            except Exception as e:
+                failed += 1
+                self.record_failure(message, e)
+                # The connection may be broken; reopen it for the next message
+                try:
+                    smtp.close()
+                except Exception:
+                    pass
+            else:
+                sent += 1
+                message.status = EmailOutbox.Status.SENT
+                message.sent_at = timezone.now()
+                message.attempts += 1
+                message.last_error = None
+                redacted = message.redact()
+                message.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'] + redacted)
+
+        self.stdout.write(f"Batch of {len(batch)}: {sent} sent, {failed} failed.")
+
+    def record_failure(self, message, error):
+        message.attempts += 1
+        message.last_error = f"{type(error).__name__}: {error}"
+        redacted = []
+        if message.attempts >= self.max_attempts:
+            message.status = EmailOutbox.Status.DEAD
+            # A dead-lettered credential is never going to be delivered; the admin
+            # recovers by sending the user a password reset link instead
+            redacted = message.redact()
+            self.stderr.write(self.style.ERROR(f"Dead-lettered email #{message.pk} after {message.attempts} attempts: {message.last_error}"))
+        else:
+            message.status = EmailOutbox.Status.PENDING
+            message.next_attempt_at = timezone.now() + timedelta(seconds=self.backoff * 2 ** (message.attempts - 1))
+        message.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'] + redacted)
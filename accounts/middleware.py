@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+
+from .audit import buffered
+
+
+class AuditLogBufferMiddleware:
+    """Buffers audit entries for the duration of each request."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered():
+            return self.get_response(request)
+
+
+class LowWriteSessionMiddleware(SessionMiddleware):
+    """
+    SessionMiddleware with a sliding idle timeout that does not write on every request.
+
+    With SESSION_SAVE_EVERY_REQUEST every page view re-saves the session just to push
+    its expiry forward. Here the session is saved when its data changes, or when the
+    last save is more than SESSION_REFRESH_INTERVAL seconds old. A session therefore
+    still expires SESSION_COOKIE_AGE seconds after the last save, which is at most
+    SESSION_REFRESH_INTERVAL seconds before the user's last request.
+    Works with any SESSION_ENGINE (db, cached_db, cache).
+    """
+    REFRESHED_KEY = '_refreshed_at'
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        # Only sessions this request already loaded (e.g. to authenticate); never create one
+        if session is not None and session.accessed and response.status_code != 500 and not session.is_empty():
+            now = int(time.time())
+            interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 60)
+            if session.modified or now - session.get(self.REFRESHED_KEY, 0) >= interval:
+                session[self.REFRESHED_KEY] = now  # Marks the session modified, so it gets saved
+        return super().process_response(request, response)
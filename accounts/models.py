@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 class User(AbstractUser):
     class Role(models.TextChoices):
@@ -20,26 +21,42 @@ class User(AbstractUser):
     # Password Security
     must_change_password = models.BooleanField(default=False)
 
+    # Bumped by every full save (profile edits, activation); the staff API's ETag uses it.
+    # Saves limited by update_fields (login timestamps, lockout counters) leave it alone.
+    updated_at = models.DateTimeField(auto_now=True)
+
     def save(self, *args, **kwargs):
         if not self.pk and self.is_superuser:
             self.role = self.Role.ADMIN
         
-        # Auto-generate Staff ID if not set
-        if not self.staff_id and self.role != self.Role.ADMIN: # Admins might not need staff ID? Or yes? Use cases say "Staff ID".
-             # Simple auto-increment logic or random?
-             # Let's do simple increment: STF-{last_id + 1}
-             last_user = User.objects.filter(staff_id__startswith='STF').order_by('staff_id').last()
-             if last_user:
-                 try:
-                     last_id = int(last_user.staff_id.split('-')[1])
-                     self.staff_id = f"STF-{last_id + 1:04d}"
-                 except (IndexError, ValueError):
-                     self.staff_id = "STF-0001"
-             else:
-                 self.staff_id = "STF-0001"
+        # Auto-generate Staff ID if not set (no query at all when it already is)
+        if not self.staff_id and self.role != self.Role.ADMIN:
+            self.staff_id = User.reserve_staff_ids(1)[0]
         
         return super().save(*args, **kwargs)
 
+    @staticmethod
+    def reserve_staff_ids(count):
+        """
+        Allocates `count` staff ids (STF-NNNN) from the "staff" sequence in one round trip.
+        Use for bulk onboarding, where save() is not called.
+        """
+        from university.models import Sequence
+
+        def highest_existing():
+            # Runs once, when the sequence row is first created. Compare numerically:
+            # ordering the strings would put STF-9999 after STF-10000.
+            highest = 0
+            for staff_id in User.objects.filter(staff_id__startswith='STF-').values_list('staff_id', flat=True):
+                try:
+                    highest = max(highest, int(staff_id.split('-')[1]))
+                except (IndexError, ValueError):
+                    pass
+            return highest
+
+        first = Sequence.allocate("staff", count, seed=highest_existing)
+        return [f"STF-{n:04d}" for n in range(first, first + count)]
+
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
 
@@ -50,10 +67,64 @@ class AuditLog(models.Model):
     target_id = models.CharField(max_length=50, blank=True, null=True)
     details = models.TextField(blank=True, null=True) # JSON or text justification
     ip_address = models.GenericIPAddressField(blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is recorded, not when the buffered writer flushes it (see accounts.audit)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Keyset pagination in the audit log viewer walks (timestamp, id)
+            models.Index(fields=['timestamp', 'id'], name='auditlog_ts_id_idx'),
+            models.Index(fields=['action', 'timestamp'], name='auditlog_action_ts_idx'),
+            models.Index(fields=['target_model', 'target_id'], name='auditlog_target_idx'),
+        ]
 
     def __str__(self):
         return f"{self.timestamp} - {self.actor} - {self.action}"
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email queued by the views (accounts.utils.queue_email) and
+    delivered by `manage.py run_email_worker`.
+    """
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        DEAD = "DEAD", "Dead letter"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True, null=True)
+    from_email = models.CharField(max_length=254, blank=True, null=True)
+    recipients = models.JSONField(default=list)
+    # Bodies carrying credentials (e.g. temporary passwords) are blanked by the worker
+    # once the message is sent or dead-lettered, so they don't sit in the table forever
+    sensitive = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    REDACTED_BODY = "[redacted after delivery]"
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+    def redact(self):
+        """Drops the body of a sensitive message; returns the fields to save."""
+        if not self.sensitive:
+            return []
+        self.body = self.REDACTED_BODY
+        self.html_body = None
+        return ['body', 'html_body']
@@ -16,11 +16,11 @@ def log_login_failed(sender, credentials, request, **kwargs):
     # For failed login, we don't have a user object, so we log as System or None
     # We record the attempted username in details
     username = credentials.get('username', 'unknown')
-    from .models import AuditLog
-    # Create manually since log_action expects a user instance usually
+    # Record manually since log_action expects a user instance usually
     from .utils import get_client_ip
+    from . import audit
     ip = get_client_ip(request) if request else None
-    AuditLog.objects.create(
+    audit.record(
         action="LOGIN_FAILED",
         details=f"Failed login attempt for username: {username}",
         ip_address=ip
@@ -0,0 +1,54 @@
+import io
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models.query import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts import archive
+from accounts.models import AuditLog, User
+
+
+class ArchiveAuditLogsTests(TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(AUDIT_LOG_ARCHIVE_DIR=tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.actor = User.objects.create(username='admin1', role=User.Role.ADMIN)
+        old = timezone.now() - timedelta(days=200)
+        for i, action in enumerate(['CREATE_USER', 'UPDATE_TASKFORCE', 'CREATE_USER']):
+            log = AuditLog.objects.create(actor=self.actor, action=action, target_model='User', target_id=str(i))
+            AuditLog.objects.filter(pk=log.pk).update(timestamp=old + timedelta(minutes=i))
+        self.recent = AuditLog.objects.create(actor=self.actor, action='CREATE_USER', target_model='User', target_id='9')
+
+    def archive(self):
+        call_command('archive_audit_logs', days=90, batch_size=2, stdout=io.StringIO())
+
+    def test_round_trip(self):
+        self.archive()
+        self.assertEqual(list(AuditLog.objects.values_list('pk', flat=True)), [self.recent.pk])
+
+        rows = list(archive.iter_rows())
+        self.assertEqual([row['target_id'] for row in rows], ['0', '1', '2'])
+        self.assertEqual(rows[0]['actor_username'], 'admin1')
+        self.assertEqual([row['target_id'] for row in archive.iter_rows(action='CREATE_USER')], ['0', '2'])
+        self.assertEqual(list(archive.iter_rows(start=timezone.now() - timedelta(days=1))), [])
+
+    def test_rerun_after_a_failed_delete_does_not_duplicate_rows(self):
+        with mock.patch.object(QuerySet, 'delete', side_effect=RuntimeError('crash')):
+            with self.assertRaises(RuntimeError):
+                self.archive()
+        self.assertEqual(AuditLog.objects.count(), 4)  # Archived but still live
+
+        self.archive()
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual([row['target_id'] for row in archive.iter_rows()], ['0', '1', '2'])
+        partitions = archive.load_index()['partitions']
+        self.assertEqual(sum(entry['rows'] for entry in partitions.values()), 3)
@@ -0,0 +1,95 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import EmailOutbox
+
+
+def failing_send():
+    return mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError('down'))
+
+
+def run_worker(**options):
+    call_command('run_email_worker', once=True, stdout=io.StringIO(), stderr=io.StringIO(), **options)
+
+
+class EmailWorkerTests(TestCase):
+
+    def queue(self, **fields):
+        data = {'subject': 'Hello', 'body': 'Your password is hunter2', 'html_body': '<p>hunter2</p>',
+                'from_email': 'tfms@example.com', 'recipients': ['lect1@example.com']}
+        data.update(fields)
+        return EmailOutbox.objects.create(**data)
+
+    def test_sensitive_body_is_redacted_once_sent(self):
+        message = self.queue(sensitive=True)
+        run_worker()
+        message.refresh_from_db()
+        self.assertEqual(message.status, EmailOutbox.Status.SENT)
+        self.assertEqual(message.body, EmailOutbox.REDACTED_BODY)
+        self.assertIsNone(message.html_body)
+        # The recipient still got the real text
+        self.assertIn('hunter2', mail.outbox[0].body)
+
+    def test_ordinary_body_is_kept_once_sent(self):
+        message = self.queue()
+        run_worker()
+        message.refresh_from_db()
+        self.assertEqual(message.status, EmailOutbox.Status.SENT)
+        self.assertEqual(message.body, 'Your password is hunter2')
+
+    def test_sensitive_body_is_redacted_when_dead_lettered(self):
+        message = self.queue(sensitive=True)
+        with failing_send():
+            run_worker(max_attempts=1)
+        message.refresh_from_db()
+        self.assertEqual(message.status, EmailOutbox.Status.DEAD)
+        self.assertEqual(message.body, EmailOutbox.REDACTED_BODY)
+        self.assertIsNone(message.html_body)
+
+    def test_failed_message_is_retried_after_a_backoff(self):
+        message = self.queue()
+        with failing_send():
+            run_worker(backoff=60)
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (EmailOutbox.Status.PENDING, 1))
+        self.assertIn('OSError', message.last_error)
+        self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        run_worker()  # Not due yet
+        self.assertEqual(len(mail.outbox), 0)
+
+        EmailOutbox.objects.filter(pk=message.pk).update(next_attempt_at=timezone.now())
+        run_worker()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), (EmailOutbox.Status.SENT, 2, None))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_backoff_doubles_and_the_message_is_dead_lettered_at_max_attempts(self):
+        message = self.queue()
+        delays = []
+        for _ in range(3):
+            EmailOutbox.objects.filter(pk=message.pk).update(next_attempt_at=timezone.now())
+            with failing_send():
+                run_worker(backoff=60, max_attempts=3)
+            message.refresh_from_db()
+            delays.append(round((message.next_attempt_at - timezone.now()).total_seconds() / 60))
+        self.assertEqual(message.status, EmailOutbox.Status.DEAD)
+        self.assertEqual(delays[:2], [1, 2])
+
+        run_worker()  # Dead letters are never picked up again
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_messages_stuck_in_sending_are_picked_up_again(self):
+        stuck = self.queue(status=EmailOutbox.Status.SENDING, locked_at=timezone.now() - timedelta(hours=1))
+        busy = self.queue(status=EmailOutbox.Status.SENDING, locked_at=timezone.now())
+        run_worker()
+        stuck.refresh_from_db()
+        busy.refresh_from_db()
+        self.assertEqual(stuck.status, EmailOutbox.Status.SENT)
+        self.assertEqual(busy.status, EmailOutbox.Status.SENDING)
@@ -0,0 +1,46 @@
+import time
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db', SESSION_REFRESH_INTERVAL=60, AUDIT_LOG_SYNC=True)
+class LowWriteSessionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = User.objects.create_user('lect1', 'lect1@example.com', 'pw', role=User.Role.LECTURER)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.lecturer)
+        self.url = reverse('dashboard:lecturer')
+        self.client.get(self.url)  # First request stamps the refresh time
+
+    def expiry(self):
+        return Session.objects.get(session_key=self.client.session.session_key).expire_date
+
+    def get_at(self, seconds_later):
+        with mock.patch('accounts.middleware.time.time', return_value=time.time() + seconds_later):
+            self.client.get(self.url)
+
+    def test_requests_within_the_interval_do_not_save_the_session(self):
+        before = self.expiry()
+        self.get_at(10)
+        self.assertEqual(self.expiry(), before)  # A save would have moved it
+
+    def test_request_after_the_interval_pushes_the_expiry(self):
+        before = self.expiry()
+        self.get_at(120)
+        self.assertGreater(self.expiry(), before)
+
+    def test_anonymous_requests_create_no_session(self):
+        self.client.logout()
+        Session.objects.all().delete()
+        self.client.get(reverse('login'))
+        self.assertFalse(Session.objects.exists())
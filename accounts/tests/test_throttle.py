@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from accounts import throttle
+from accounts.models import User
+
+
+class ClientIpTests(TestCase):
+
+    def request(self, **meta):
+        return RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', **meta)
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        request = self.request(HTTP_X_FORWARDED_FOR='1.2.3.4')
+        self.assertEqual(throttle.client_ip(request), '10.0.0.1')
+
+    @override_settings(THROTTLE_TRUSTED_PROXIES=1)
+    def test_only_the_entry_added_by_the_trusted_proxy_is_used(self):
+        # The client made up '6.6.6.6'; the proxy appended the address it saw
+        request = self.request(HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4')
+        self.assertEqual(throttle.client_ip(request), '1.2.3.4')
+
+
+@override_settings(THROTTLE_ENABLED=True, AUDIT_LOG_SYNC=True)
+class LoginThrottleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = User.objects.create_user('lect1', 'lect1@example.com', 'right-password', role=User.Role.LECTURER)
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, password='wrong-password', username='lect1', **extra):
+        return self.client.post(reverse('login'), {'username': username, 'password': password}, **extra)
+
+    @override_settings(THROTTLE_RATES={'login_ip': (2, 1), 'login_username': (100, 1)})
+    def test_rotating_forwarded_for_does_not_reset_the_ip_bucket(self):
+        for n in range(2):
+            self.assertEqual(self.login(username=f'nobody{n}', HTTP_X_FORWARDED_FOR=f'1.1.1.{n}').status_code, 200)
+        response = self.login(username='nobody9', HTTP_X_FORWARDED_FOR='1.1.1.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(int(response['Retry-After']) > 0)
+
+    @override_settings(THROTTLE_RATES={'login_ip': (100, 1), 'login_username': (1, 1)})
+    def test_throttled_login_does_not_check_the_password(self):
+        self.login()
+        response = self.login(password='right-password')
+        self.assertEqual(response.status_code, 429)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_three_failures_lock_the_account(self):
+        for _ in range(3):
+            self.login()
+        self.lecturer.refresh_from_db()
+        self.assertEqual(self.lecturer.failed_attempts, 3)
+        self.assertTrue(self.lecturer.is_locked)
+
+        self.login(password='right-password')
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_admins_are_never_locked(self):
+        User.objects.create_user('admin1', 'admin1@example.com', 'right-password', role=User.Role.ADMIN)
+        for _ in range(3):
+            self.login(username='admin1')
+        self.assertFalse(User.objects.get(username='admin1').is_locked)
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_RATES={'api': (2, 1)})
+class ApiThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('lect1', 'lect1@example.com', 'pw', role=User.Role.LECTURER)
+        self.view = throttle.throttle_api(lambda request: JsonResponse({'ok': True}))
+
+    def call(self, user):
+        request = RequestFactory().get('/api/')
+        request.user = user
+        return self.view(request)
+
+    def test_calls_over_the_burst_get_429(self):
+        self.assertEqual([self.call(self.user).status_code for _ in range(3)], [200, 200, 429])
+        self.assertIn('Retry-After', self.call(self.user))
+
+    def test_buckets_are_per_user(self):
+        other = User.objects.create_user('lect2', 'lect2@example.com', 'pw', role=User.Role.LECTURER)
+        for _ in range(3):
+            self.call(self.user)
+        self.assertEqual(self.call(other).status_code, 200)
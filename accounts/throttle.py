@@ -0,0 +1,114 @@
+"""
+Token-bucket rate limits kept in the Django cache.
+
+Each (scope, key) pair has a bucket holding up to `burst` tokens that refills at
+`per_minute` tokens a minute; every request takes one token and is refused when
+the bucket is empty. Buckets live in the default cache, which is shared by every
+worker with the default file-based backend (see CACHES in settings); with
+LocMemCache each process would keep its own buckets. Read-modify-write is not atomic across
+processes; a race lets at most a few extra requests through, which is fine for
+throttling.
+
+Scopes are configured in THROTTLE_RATES as scope -> (burst, per_minute):
+    login_ip        login attempts per client IP
+    login_username  login attempts per attempted username
+    api             API calls per user per endpoint; 'api:<url name>' overrides
+                    it for one endpoint (e.g. 'api:dashboard:staff_list_api')
+THROTTLE_ENABLED = False turns every check off.
+
+Per-IP buckets key on REMOTE_ADDR. X-Forwarded-For is set by the client, so it is
+only used behind THROTTLE_TRUSTED_PROXIES reverse proxies, and then only the entry
+the outermost trusted proxy appended (see client_ip).
+"""
+import functools
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+DEFAULT_RATES = {
+    'login_ip': (20, 10),
+    'login_username': (5, 2),
+    'api': (120, 120),
+}
+
+
+def _rate(scope):
+    rates = getattr(settings, 'THROTTLE_RATES', {})
+    if scope in rates:
+        return rates[scope]
+    base = scope.split(':', 1)[0]
+    return rates.get(base, DEFAULT_RATES.get(base))
+
+
+def client_ip(request):
+    """
+    The address to throttle on. Unlike accounts.utils.get_client_ip (fine for audit
+    logs), this never trusts a client-supplied X-Forwarded-For entry: with N trusted
+    proxies in front of the app the client is the Nth address from the right.
+    """
+    proxies = getattr(settings, 'THROTTLE_TRUSTED_PROXIES', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        addresses = [address.strip() for address in forwarded.split(',') if address.strip()]
+        if addresses:
+            return addresses[-min(proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR')
+
+
+def consume(scope, key):
+    """
+    Takes one token from the (scope, key) bucket.
+    Returns 0 when the request may go ahead, else the seconds until a token is available.
+    """
+    rate = _rate(scope)
+    if not getattr(settings, 'THROTTLE_ENABLED', True) or not rate or key in (None, ''):
+        return 0
+    burst, per_minute = rate
+    per_second = per_minute / 60.0
+
+    cache_key = f'throttle:{scope}:{key}'
+    now = time.time()
+    tokens, updated = cache.get(cache_key, (burst, now))
+    tokens = min(burst, tokens + (now - updated) * per_second)
+    if tokens < 1:
+        return math.ceil((1 - tokens) / per_second) if per_second else 60
+    # Kept until the bucket would be full again; after that a missing key means "full"
+    cache.set(cache_key, (tokens - 1, now), timeout=math.ceil(burst / per_second) + 1 if per_second else None)
+    return 0
+
+
+def reset(scope, key):
+    cache.delete(f'throttle:{scope}:{key}')
+
+
+def check_login(request, username):
+    """
+    Checks the per-IP and per-username login buckets.
+    Returns 0 or the seconds to wait; call before the password is checked.
+    """
+    wait = consume('login_ip', client_ip(request))
+    if not wait and username:
+        wait = consume('login_username', username.strip().lower()[:150])
+    return wait
+
+
+def throttle_api(view):
+    """
+    Per-user, per-endpoint limit for JSON API views; over-limit calls get a 429 with Retry-After.
+    Put it under @login_required so anonymous calls are redirected first.
+    """
+    @functools.wraps(view)
+    def wrapped(request, *args, **kwargs):
+        match = getattr(request, 'resolver_match', None)
+        scope = f"api:{match.view_name if match else view.__name__}"
+        key = request.user.pk if request.user.is_authenticated else client_ip(request)
+        wait = consume(scope, key)
+        if wait:
+            response = JsonResponse({'error': 'Too many requests. Please slow down.'}, status=429)
+            response['Retry-After'] = str(wait)
+            return response
+        return view(request, *args, **kwargs)
+    return wrapped
@@ -1,4 +1,7 @@
-from .models import AuditLog
+from django.conf import settings
+from django.db import transaction
+from .models import EmailOutbox
+from . import audit
 
 def get_client_ip(request):
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -14,7 +17,7 @@ def log_action(request, user, action, target_model=None, target_id=None, details
     """
     ip = get_client_ip(request) if request else None
     
-    AuditLog.objects.create(
+    audit.record(
         actor=user,
         action=action,
         target_model=target_model,
@@ -22,3 +25,27 @@ def log_action(request, user, action, target_model=None, target_id=None, details
         details=details,
         ip_address=ip
     )
+
+def queue_email(subject, message, recipient_list, html_message=None, from_email=None, sensitive=False):
+    """
+    Helper to send email without blocking the request.
+    The message is written to the EmailOutbox once the current transaction commits
+    (immediately outside a transaction); `manage.py run_email_worker` delivers it.
+    Pass sensitive=True for messages carrying credentials; their bodies are
+    redacted once the message is sent or dead-lettered.
+    """
+    recipients = [email for email in recipient_list if email]
+    if not recipients:
+        return
+
+    def write():
+        EmailOutbox.objects.create(
+            subject=subject,
+            body=message,
+            html_body=html_message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=recipients,
+            sensitive=sensitive,
+        )
+
+    transaction.on_commit(write)
@@ -2,6 +2,8 @@ from django.contrib.auth.views import LoginView
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.contrib.auth import get_user_model
+from django.db.models import F
+from . import throttle
 
 User = get_user_model()
 
@@ -30,6 +32,18 @@ class CustomLoginView(LoginView):
 
         return url
 
+    def post(self, request, *args, **kwargs):
+        # Over-limit attempts are refused before the form hashes the password or touches the DB
+        wait = throttle.check_login(request, request.POST.get('username'))
+        if wait:
+            messages.error(request, f"Too many login attempts. Please try again in {wait} seconds.")
+            # Unbound: rendering a bound form would validate it, i.e. check the password
+            form = self.get_form_class()(request, initial={'username': request.POST.get('username', '')})
+            response = self.render_to_response(self.get_context_data(form=form), status=429)
+            response['Retry-After'] = str(wait)
+            return response
+        return super().post(request, *args, **kwargs)
+
     def form_valid(self, form):
         """
         Security: Reset failed attempts on successful login.
@@ -43,7 +57,7 @@ class CustomLoginView(LoginView):
         # Reset attempts on success
         if user.failed_attempts > 0:
             user.failed_attempts = 0
-            user.save()
+            user.save(update_fields=['failed_attempts'])
             
         if user.must_change_password:
             from django.contrib.auth import login
@@ -60,7 +74,7 @@ class CustomLoginView(LoginView):
         username = form.data.get('username')
         if username:
             try:
-                user = User.objects.get(username=username)
+                user = User.objects.only('pk', 'is_active', 'is_superuser', 'role', 'is_locked').get(username=username)
                 if not user.is_active:
                     messages.error(self.request, "Your account has been deactivated. Please contact the Administrator.")
                     return super().form_invalid(form)
@@ -72,14 +86,11 @@ class CustomLoginView(LoginView):
                 if user.is_locked:
                     messages.error(self.request, "Your account has been locked due to multiple failed login attempts. Please contact the Administrator.")
                 else:
-                    user.failed_attempts += 1
-                    if user.failed_attempts >= 3:
-                        user.is_locked = True
-                        user.save()
+                    # Atomic increment, so concurrent failures can't overwrite each other's count
+                    User.objects.filter(pk=user.pk).update(failed_attempts=F('failed_attempts') + 1)
+                    if User.objects.filter(pk=user.pk, failed_attempts__gte=3, is_locked=False).update(is_locked=True):
                         messages.error(self.request, "Your account has been locked due to multiple failed login attempts. Please contact the Administrator.")
-                    else:
-                        user.save()
-                        # Optional: Tell them how many attempts left? maybe not for security obscuration.
+                    # Optional: Tell them how many attempts left? maybe not for security obscuration.
                         
             except User.DoesNotExist:
                 # Do nothing if user doesn't exist (prevent enumeration timing attacks ideally, but simple here)
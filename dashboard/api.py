@@ -1,24 +1,88 @@
+import base64
+import hashlib
+import json
+
 from django.http import JsonResponse
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from university.services import WorkloadService
+from django.db.models import Count, Max, Q
+from django.views.decorators.http import require_POST
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from university.cache import get_workload_settings
+from university.models import TaskForce, StaffWorkload
+from university.services import RosterService, WorkloadService
+from accounts.throttle import throttle_api
+from tfms_core.replica import replica_reads
 
 User = get_user_model()
 
+STAFF_PAGE_SIZE = 100
+STAFF_MAX_PAGE_SIZE = 500
+STAFF_FIELDS = ['id', 'name', 'email', 'role', 'workload']
+
+
+def _encode_cursor(last_id):
+    raw = json.dumps({'after': last_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Returns the last id of the previous page, or raises ValueError for a malformed cursor."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        after = json.loads(base64.urlsafe_b64decode(padded.encode()))['after']
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+def _roster_validators(request, users):
+    """
+    ETag and Last-Modified for a filtered roster.
+    Changes to memberships (StaffWorkload.updated_at), task forces, the matching
+    users (who they are, and edits to their name, email, role or department via
+    User.updated_at) and the workload thresholds all produce a new ETag.
+    """
+    roster = users.aggregate(count=Count('pk'), max_id=Max('pk'), last_edit=Max('updated_at'))
+    last_membership = StaffWorkload.objects.aggregate(latest=Max('updated_at'))['latest']
+    last_taskforce = TaskForce.objects.aggregate(latest=Max('updated_at'))['latest']
+    last_modified = max(filter(None, [last_membership, last_taskforce, roster['last_edit']]), default=None)
+
+    settings = get_workload_settings()
+    thresholds = (settings.min_weightage, settings.max_weightage) if settings else None
+
+    fingerprint = repr((
+        request.GET.urlencode(), roster['count'], roster['max_id'], roster['last_edit'],
+        last_membership, last_taskforce, thresholds,
+    ))
+    etag = '"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+    return etag, last_modified
+
+
 @login_required
+@throttle_api
+@replica_reads()
 def staff_list_api(request):
     """
     API to get list of staff for a specific department (or all) with workload status.
     Query Params:
     - department_id: Filter by department
+    - department_ids: Comma-separated department ids
     - role: Filter by role (e.g. LECTURER)
+    - fields: Comma-separated subset of id,name,email,role,workload (default: all)
+    - limit: Page size (default 100, max 500)
+    - cursor: Opaque cursor from the previous page's next_cursor
+    Responses carry ETag/Last-Modified; unchanged rosters return 304.
     """
     department_id = request.GET.get('department_id')
     department_ids = request.GET.get('department_ids')
     role = request.GET.get('role')
-    
+
     users = User.objects.filter(is_active=True)
-    
+
     if department_ids:
         ids = []
         for raw_id in department_ids.split(','):
@@ -29,7 +93,7 @@ def staff_list_api(request):
             users = users.filter(department_id__in=ids)
     elif department_id:
         users = users.filter(department_id=department_id)
-        
+
     if role:
         # Map simple role name to DB constant if needed, or assume direct match
         # For safety, let's look up choices
@@ -37,16 +101,195 @@ def staff_list_api(request):
             users = users.filter(role=User.Role.LECTURER)
         elif role == 'HOD':
             users = users.filter(role=User.Role.HOD)
-            
+
+    fields = STAFF_FIELDS
+    if request.GET.get('fields'):
+        fields = [f for f in STAFF_FIELDS if f in request.GET['fields'].split(',')]
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+
+    try:
+        limit = min(max(int(request.GET.get('limit', STAFF_PAGE_SIZE)), 1), STAFF_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+    etag, last_modified = _roster_validators(request, users)
+    last_modified_ts = last_modified.timestamp() if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if not_modified is not None:
+        # A 304 repeats the validators (RFC 9110 15.4.5)
+        not_modified['ETag'] = etag
+        not_modified['Cache-Control'] = 'private, no-cache'
+        return not_modified
+
+    # Primary-key order is stable across pages even while rosters change
+    page = users.order_by('pk')
+    if request.GET.get('cursor'):
+        try:
+            page = page.filter(pk__gt=_decode_cursor(request.GET['cursor']))
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+    users = list(page[:limit + 1])
+    has_more = len(users) > limit
+    users = users[:limit]
+
+    statuses = WorkloadService.bulk_workload_status(users) if 'workload' in fields else {}
+
     data = []
     for user in users:
-        status_data = WorkloadService.get_workload_status(user)
-        data.append({
+        row = {
             'id': user.id,
             'name': user.get_full_name() or user.username,
             'email': user.email,
             'role': user.get_role_display(),
-            'workload': status_data
-        })
-        
-    return JsonResponse({'staff': data})
+            'workload': statuses.get(user.id),
+        }
+        data.append({field: row[field] for field in fields})
+
+    response = JsonResponse({
+        'staff': data,
+        'next_cursor': _encode_cursor(users[-1].id) if has_more else None,
+    })
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified_ts)
+    # Let browsers keep the body but revalidate on every picker load
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _simulation_taskforces(user):
+    """Task forces the user may plan rosters for (the same ones their manage pages allow)."""
+    if user.role == User.Role.HOD:
+        if not user.department_id:
+            return TaskForce.objects.none()
+        return TaskForce.objects.filter(departments=user.department_id)
+    if user.role == User.Role.PSM:
+        return TaskForce.objects.filter(
+            Q(status='SUBMITTED', assigned_psm__isnull=True) | Q(assigned_psm=user)
+        )
+    return TaskForce.objects.none()
+
+
+def _id_list(value):
+    """[1, "2"] or "1,2" -> {1, 2}. Raises ValueError on anything else."""
+    if value in (None, ''):
+        return set()
+    if isinstance(value, str):
+        value = [v for v in value.split(',') if v.strip()]
+    if not isinstance(value, list):
+        raise ValueError
+    return {int(v) for v in value}
+
+
+@login_required
+@require_POST
+@throttle_api
+def roster_simulation_api(request, pk):
+    """
+    What-if workload for a proposed roster, in one round trip.
+    Body (JSON, or form fields with comma-separated ids):
+    - add: user ids to add to the current members
+    - remove: user ids to take off
+    - weightage: proposed weightage (default: the task force's)
+    - department_ids: candidate pool departments (default: the task force's, or
+      the HOD's own department); must be within that default
+    - pool: false to leave out the candidate pool
+    Added users must be current members or lecturers in the candidate pool and
+    removed users current members; anything else is a 400.
+    Returns before/after workload status for every current, added and removed
+    member and for each active lecturer in the pool ('if_added' for non-members).
+    """
+    taskforce = _simulation_taskforces(request.user).filter(pk=pk).only('pk', 'weightage', 'status').first()
+    if taskforce is None:
+        return JsonResponse({'error': 'Task force not found'}, status=404)
+
+    if request.content_type == 'application/json':
+        try:
+            body = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(body, dict):
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    else:
+        body = request.POST.dict()
+
+    try:
+        add_ids = _id_list(body.get('add'))
+        remove_ids = _id_list(body.get('remove'))
+        department_ids = _id_list(body.get('department_ids'))
+        weightage = body.get('weightage')
+        weightage = None if weightage in (None, '') else int(weightage)
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'add, remove and department_ids must be lists of ids; weightage an integer'}, status=400)
+    if weightage is not None and weightage < 0:
+        return JsonResponse({'error': 'weightage must not be negative'}, status=400)
+
+    # Candidates are active lecturers from the departments the caller plans for:
+    # an HOD's own department, or the task force's departments for a PSM
+    if request.user.role == User.Role.HOD:
+        allowed_departments = {request.user.department_id}
+    else:
+        allowed_departments = set(
+            TaskForce.departments.through.objects.filter(taskforce_id=taskforce.pk).values_list('department_id', flat=True)
+        )
+    if not department_ids <= allowed_departments:
+        return JsonResponse({'error': 'department_ids must be departments of this task force you plan for'}, status=400)
+    eligible = User.objects.filter(
+        is_active=True, role=User.Role.LECTURER, department_id__in=department_ids or allowed_departments,
+    )
+
+    if add_ids or remove_ids:
+        current = set(
+            TaskForce.members.through.objects.filter(taskforce_id=taskforce.pk, user_id__in=add_ids | remove_ids)
+            .values_list('user_id', flat=True)
+        )
+        if not remove_ids <= current:
+            return JsonResponse({'error': 'remove may only list current members', 'ids': sorted(remove_ids - current)}, status=400)
+        outside = add_ids - current - set(eligible.filter(pk__in=add_ids).values_list('pk', flat=True))
+        if outside:
+            return JsonResponse({'error': 'add may only list lecturers from the candidate pool', 'ids': sorted(outside)}, status=400)
+
+    pool = eligible if str(body.get('pool', True)).lower() not in ('false', '0') else None
+
+    result = WorkloadService.simulate_roster(taskforce, add_ids, remove_ids, pool=pool, weightage=weightage)
+    return JsonResponse({
+        'taskforce': {
+            'id': taskforce.pk,
+            'status': taskforce.status,
+            'weightage': taskforce.weightage,
+            'proposed_weightage': taskforce.weightage if weightage is None else weightage,
+            # False for REJECTED/INACTIVE: the roster then adds nothing to anyone's load
+            'counted': taskforce.status in WorkloadService.RELEVANT_STATUSES,
+        },
+        'members': result['members'],
+        'overloaded': [
+            row['id'] for row in result['staff'] if row['member_after'] and row['after']['status'] == 'OVERLOADED'
+        ],
+        'staff': result['staff'],
+    })
+
+
+@login_required
+@throttle_api
+def roster_suggestion_api(request, pk):
+    """
+    Balanced members to add to a task force (see RosterService.suggest_roster).
+    Query Params:
+    - headcount: Desired roster size (default 3)
+    - members: Comma-separated ids of the roster being edited (default: saved members)
+    HODs get candidates from their own department, PSMs from the task force's departments.
+    """
+    taskforce = _simulation_taskforces(request.user).filter(pk=pk).only('pk', 'weightage', 'status').first()
+    if taskforce is None:
+        return JsonResponse({'error': 'Task force not found'}, status=404)
+
+    try:
+        headcount = min(max(int(request.GET.get('headcount', 3)), 0), 100)
+        members = _id_list(request.GET.get('members')) if 'members' in request.GET else None
+    except ValueError:
+        return JsonResponse({'error': 'headcount must be an integer and members a list of ids'}, status=400)
+
+    department_ids = [request.user.department_id] if request.user.role == User.Role.HOD else None
+    suggestions, shortfall = RosterService.suggest_roster(taskforce, headcount, department_ids=department_ids, members=members)
+    return JsonResponse({'suggestions': suggestions, 'shortfall': shortfall})
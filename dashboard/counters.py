@@ -0,0 +1,124 @@
+"""
+Cached counters for the Admin, PSM and Dean dashboards.
+
+Each dashboard's numbers come from one conditional-aggregation query
+(Count(..., filter=Q(...))). Results are cached with the version current at
+load time; dashboard.signals replaces VERSION_KEY after TaskForce, User and
+Department writes commit, which marks every cached entry outdated.
+
+Counters that merely expired are recomputed on the read replica when one is
+configured. After an invalidation they are recomputed on the primary: the
+replica may not have the write yet, and an entry filled from it would be
+shared with every user until the next write or TTL.
+
+Outdated or expired entries are served stale-while-revalidate: the first
+request to notice takes a short lock and recomputes, and concurrent requests
+keep getting the previous numbers for up to DASHBOARD_COUNTERS_STALE_SECONDS
+instead of all running the query at once.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import User
+from tfms_core.replica import primary_reads, replica_reads
+from university.models import Department, TaskForce
+
+VERSION_KEY = 'dashboard:counters:version'
+
+
+def _fresh_seconds():
+    return getattr(settings, 'DASHBOARD_COUNTERS_TTL', 300)
+
+
+def _stale_seconds():
+    return getattr(settings, 'DASHBOARD_COUNTERS_STALE_SECONDS', 30)
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """Marks every cached counter outdated."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def _cached(name, loader):
+    key = f'dashboard:counters:{name}'
+    version = _current_version()
+    now = time.time()
+
+    entry = cache.get(key)
+    if entry is not None:
+        if entry['version'] == version and now < entry['fresh_until']:
+            return entry['value']
+        # Outdated: one request recomputes, the rest get the old numbers meanwhile
+        if now < entry['fresh_until'] + _stale_seconds() and not cache.add(f'{key}:refresh', 1, timeout=_stale_seconds()):
+            return entry['value']
+
+    # Same version: nothing was written since the last load, so the replica is fine
+    reads = replica_reads if entry is not None and entry['version'] == version else primary_reads
+    with reads():
+        value = loader()
+    cache.set(key, {
+        'value': value,
+        'version': version,
+        'fresh_until': now + _fresh_seconds(),
+    }, timeout=_fresh_seconds() + _stale_seconds())
+    cache.delete(f'{key}:refresh')
+    return value
+
+
+def count_of(queryset, outer_field=None):
+    """
+    Scalar subquery: SELECT COUNT(*) over the queryset, as an annotation or aggregate
+    argument. With outer_field, only rows whose outer_field points at the outer
+    query's row are counted. 0 when there are none.
+    """
+    if outer_field:
+        queryset = queryset.filter(**{outer_field: OuterRef('pk')})
+    return Coalesce(Subquery(queryset.order_by().values(_all=Value(1)).annotate(n=Count('pk')).values('n')), 0)
+
+
+def admin_counters():
+    """staff_count, taskforce_count and department_count."""
+    def load():
+        # Aggregating over users: the table is never empty here (the admin viewing
+        # the page is in it), so the other tables' counts ride along as MAX(subquery)
+        counts = User.objects.aggregate(
+            staff_count=Count('pk', filter=~Q(role=User.Role.ADMIN)),
+            taskforce_count=Max(count_of(TaskForce.objects.all())),
+            department_count=Max(count_of(Department.objects.all())),
+        )
+        return {name: value or 0 for name, value in counts.items()}
+    return _cached('admin', load)
+
+
+def psm_counters(user):
+    """pending_count (all SUBMITTED) and actioned_count (assigned to this PSM)."""
+    def load():
+        return TaskForce.objects.aggregate(
+            pending_count=Count('pk', filter=Q(status='SUBMITTED')),
+            actioned_count=Count('pk', filter=Q(assigned_psm=user)),
+        )
+    return _cached(f'psm:{user.pk}', load)
+
+
+def dean_counters():
+    """total_taskforces, active_taskforces (APPROVED) and pending_approvals (SUBMITTED)."""
+    def load():
+        return TaskForce.objects.aggregate(
+            total_taskforces=Count('pk'),
+            active_taskforces=Count('pk', filter=Q(status='APPROVED')),
+            pending_approvals=Count('pk', filter=Q(status='SUBMITTED')),
+        )
+    return _cached('dean', load)
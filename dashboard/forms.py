@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from university.models import TaskForce, Department
+from university.cache import get_departments, get_workload_settings
 
 User = get_user_model()
 
@@ -30,6 +31,13 @@ class StaffForm(forms.ModelForm):
              'last_name': forms.TextInput(attrs={'class': 'form-control'}),
              'role': forms.Select(attrs={'class': 'form-select', 'id': 'id_role'}), # Added ID for JS targeting
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Render the dropdown from the reference-data cache; the queryset is still used to validate
+        self.fields['department'].choices = [('', self.fields['department'].empty_label)] + [
+            (dept.pk, dept.name) for dept in get_departments()
+        ]
     
     def clean(self):
         cleaned_data = super().clean()
@@ -48,6 +56,18 @@ class StaffForm(forms.ModelForm):
             
         return cleaned_data
 
+class StaffImportUploadForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV or XLSX with columns: username, first_name, last_name, email, role, department",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'})
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        initial=True,
+        label="Dry run (validate only, create nothing)",
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
 class WorkloadSettingsForm(forms.ModelForm):
     class Meta:
         from university.models import WorkloadSettings
@@ -87,7 +107,6 @@ class TaskForceForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        from university.models import WorkloadSettings
         
         # Restrict Status choices for Admin (Create/Deactivate only)
         # Using the keys from TaskForce.STATUS_CHOICES: 'ACTIVE', 'INACTIVE'
@@ -97,7 +116,7 @@ class TaskForceForm(forms.ModelForm):
             if choice[0] in allowed_statuses
         ]
 
-        settings = WorkloadSettings.objects.first()
+        settings = get_workload_settings()
         if settings:
             self.fields['weightage'].widget.attrs.update({
                 'min': settings.min_weightage,
@@ -110,9 +129,8 @@ class TaskForceForm(forms.ModelForm):
         
     def clean_weightage(self):
         weightage = self.cleaned_data.get('weightage')
-        from university.models import WorkloadSettings
         # Get singleton or defaults (0, 30) if not exists yet
-        settings = WorkloadSettings.objects.first() 
+        settings = get_workload_settings()
         min_val = settings.min_weightage if settings else 0
         max_val = settings.max_weightage if settings else 30
         
@@ -0,0 +1,263 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User, AuditLog
+from dashboard import counters
+from university import cache as refdata
+from university.models import Department, TaskForce, WorkloadSettings
+
+# departments, users, task forces, audit log rows
+PRESETS = {
+    'tiny': (5, 100, 500, 10_000),
+    'small': (12, 1_000, 5_000, 100_000),
+    'medium': (30, 3_000, 20_000, 1_000_000),
+    'large': (60, 8_000, 60_000, 3_000_000),
+}
+
+DEPARTMENT_NAMES = [
+    'Computer Science', 'Software Engineering', 'Data Science', 'Cyber Security', 'Electrical Engineering',
+    'Mechanical Engineering', 'Civil Engineering', 'Chemical Engineering', 'Biomedical Engineering',
+    'Mathematics', 'Physics', 'Chemistry', 'Biology', 'Management', 'Accounting', 'Economics',
+    'Architecture', 'Education', 'Languages', 'Islamic Studies',
+]
+FIRST_NAMES = ['Aisha', 'Ahmad', 'Siti', 'Muhammad', 'Nurul', 'Wei', 'Mei', 'Raj', 'Priya', 'Daniel', 'Sarah', 'Hafiz', 'Farah', 'Kumar', 'Lim']
+LAST_NAMES = ['Abdullah', 'Tan', 'Lee', 'Rahman', 'Ismail', 'Wong', 'Ng', 'Subramaniam', 'Hassan', 'Ali', 'Chong', 'Yusof', 'Omar', 'Lim', 'Raju']
+TASKFORCE_TOPICS = [
+    'Accreditation', 'Curriculum Review', 'Industry Linkage', 'Open Day', 'Research Grant', 'Student Welfare',
+    'Quality Assurance', 'Convocation', 'Laboratory Safety', 'Digital Learning', 'Outreach', 'Postgraduate Intake',
+]
+# Weighted status mix; most task forces in a long-running system are finished
+STATUS_WEIGHTS = [('APPROVED', 45), ('INACTIVE', 20), ('ACTIVE', 10), ('DRAFT', 10), ('SUBMITTED', 8), ('REJECTED', 7)]
+AUDIT_ACTIONS = [
+    ('LOGIN', 'User', 40), ('LOGOUT', 'User', 25), ('UPDATE_TASKFORCE', 'TaskForce', 10), ('CREATE_TASKFORCE', 'TaskForce', 5),
+    ('SUBMIT_TASKFORCE', 'TaskForce', 5), ('APPROVE_TASKFORCE', 'TaskForce', 5), ('REJECT_TASKFORCE', 'TaskForce', 2),
+    ('LOGIN_FAILED', 'User', 5), ('CREATE_USER', 'User', 2), ('RESET_PASSWORD', 'User', 1),
+]
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic departments, staff, task forces and audit logs for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=PRESETS, default='small', help="Preset volume (default: small).")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed; the same seed on an empty database gives the same data.")
+        parser.add_argument('--departments', type=int, help="Override the preset's department count.")
+        parser.add_argument('--users', type=int, help="Override the preset's user count.")
+        parser.add_argument('--taskforces', type=int, help="Override the preset's task force count.")
+        parser.add_argument('--audit-logs', type=int, help="Override the preset's audit log row count.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per INSERT batch.")
+        parser.add_argument('--password', default='demo12345', help="Password for every generated account.")
+
+    def handle(self, *args, **options):
+        departments, users, taskforces, audit_logs = PRESETS[options['size']]
+        counts = {
+            'departments': options['departments'] if options['departments'] is not None else departments,
+            'users': options['users'] if options['users'] is not None else users,
+            'taskforces': options['taskforces'] if options['taskforces'] is not None else taskforces,
+            'audit_logs': options['audit_logs'] if options['audit_logs'] is not None else audit_logs,
+        }
+        if counts['departments'] < 1 or counts['users'] < 10:
+            raise CommandError("Need at least 1 department and 10 users.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # Generated usernames continue after any earlier run, so re-running adds data instead of failing
+        self.run = User.objects.filter(username__startswith='demo').count()
+        started = time.monotonic()
+
+        if not WorkloadSettings.objects.exists():
+            WorkloadSettings.objects.create(min_weightage=0, max_weightage=30)
+
+        dept_ids = self.create_departments(counts['departments'])
+        staff = self.create_users(counts['users'], dept_ids, make_password(options['password']))
+        tf_ids = self.create_taskforces(counts['taskforces'], dept_ids, staff)
+        self.create_audit_logs(counts['audit_logs'], staff, tf_ids)
+
+        # Bulk inserts skip the signals that keep these current
+        refdata.invalidate()
+        counters.invalidate()
+        call_command('rebuild_workload_ledger', stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(dept_ids)} departments, {sum(len(v) for v in staff.values())} users, "
+            f"{len(tf_ids)} task forces and {counts['audit_logs']} audit log rows in {time.monotonic() - started:.1f}s. "
+            f"Demo password: {options['password']}"
+        ))
+
+    def insert(self, model, objects):
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(objects[start:start + self.batch_size])
+
+    def create_departments(self, count):
+        existing = set(Department.objects.values_list('name', flat=True))
+        names = []
+        for i in range(count):
+            name = DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]
+            if i >= len(DEPARTMENT_NAMES):
+                name = f"{name} {i // len(DEPARTMENT_NAMES) + 1}"
+            names.append(name)
+        Department.objects.bulk_create([Department(name=n) for n in names if n not in existing])
+        ids = list(Department.objects.filter(name__in=names).order_by('pk').values_list('pk', flat=True))
+        self.stdout.write(f"Departments: {len(ids)}")
+        return ids
+
+    def create_users(self, count, dept_ids, password):
+        """One HOD per department, a few admins, deans and PSMs; everyone else is a lecturer."""
+        roles = (
+            [User.Role.ADMIN] * 2
+            + [User.Role.DEAN] * max(1, count // 1000)
+            + [User.Role.PSM] * max(2, count // 200)
+            + [User.Role.HOD] * len(dept_ids)
+        )
+        roles += [User.Role.LECTURER] * max(0, count - len(roles))
+
+        staff_ids = iter(User.reserve_staff_ids(sum(1 for r in roles if r != User.Role.ADMIN)))
+        joined = timezone.now() - timedelta(days=3 * 365)
+        objects = []
+        hod_index = 0
+        for i, role in enumerate(roles):
+            n = self.run + i
+            if role == User.Role.HOD:
+                department = dept_ids[hod_index]
+                hod_index += 1
+            elif role == User.Role.LECTURER:
+                department = self.rng.choice(dept_ids)
+            else:
+                department = None
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            objects.append(User(
+                username=f"demo{n}",
+                first_name=first,
+                last_name=last,
+                email=f"demo{n}@example.edu",
+                password=password,
+                role=role,
+                department_id=department,
+                staff_id=None if role == User.Role.ADMIN else next(staff_ids),
+                date_joined=joined + timedelta(minutes=self.rng.randrange(3 * 365 * 24 * 60)),
+            ))
+        self.insert(User, objects)
+
+        staff = {role: [] for role in User.Role.values}
+        self.hod_of = {}
+        lecturers_by_dept = {}
+        rows = User.objects.filter(username__in=[u.username for u in objects]).values_list('pk', 'role', 'department_id')
+        for pk, role, department in rows.iterator(chunk_size=self.batch_size):
+            staff[role].append(pk)
+            if role == User.Role.HOD:
+                self.hod_of[department] = pk
+            if role == User.Role.LECTURER:
+                lecturers_by_dept.setdefault(department, []).append(pk)
+        self.lecturers_by_dept = lecturers_by_dept
+        self.stdout.write(f"Users: {len(objects)} ({', '.join(f'{len(v)} {k}' for k, v in staff.items() if v)})")
+        return staff
+
+    def create_taskforces(self, count, dept_ids, staff):
+        statuses = [s for s, _ in STATUS_WEIGHTS]
+        weights = [w for _, w in STATUS_WEIGHTS]
+        lecturers = staff[User.Role.LECTURER] or staff[User.Role.HOD]
+        psms = staff[User.Role.PSM]
+
+        # Spread the task forces over the last three years, each year with its own chart id block
+        this_year = date.today().year
+        per_year = [count // 3, count // 3, count - 2 * (count // 3)]
+        chart_ids = []
+        for offset, year_count in enumerate(per_year):
+            if year_count:
+                chart_ids += TaskForce.reserve_chart_ids(year_count, year=this_year - 2 + offset)
+
+        objects = []
+        plans = []
+        for i in range(count):
+            depts = self.rng.sample(dept_ids, min(len(dept_ids), self.rng.choice([1, 1, 1, 2, 3])))
+            status = self.rng.choices(statuses, weights)[0]
+            pool = self.lecturers_by_dept.get(depts[0]) or lecturers
+            members = set(self.rng.sample(pool, min(len(pool), self.rng.randint(3, 8))))
+            if self.rng.random() < 0.3:
+                members.add(self.rng.choice(lecturers))  # Cross-department member
+            objects.append(TaskForce(
+                name=f"{self.rng.choice(TASKFORCE_TOPICS)} Committee {chart_ids[i][3:]}",
+                description="Generated by generate_demo_data.",
+                chart_id=chart_ids[i],
+                weightage=self.rng.randint(1, 10),
+                status=status,
+                submitted_by_id=self.hod_of.get(depts[0]),
+                assigned_psm_id=self.rng.choice(psms) if psms and status in ('SUBMITTED', 'APPROVED', 'REJECTED', 'INACTIVE') else None,
+                rejection_reason="Please rebalance the members." if status == 'REJECTED' else None,
+            ))
+            plans.append((chart_ids[i], depts, members))
+        self.insert(TaskForce, objects)
+
+        pk_by_chart = {}
+        for start in range(0, len(chart_ids), self.batch_size):
+            pk_by_chart.update(TaskForce.objects.filter(chart_id__in=chart_ids[start:start + self.batch_size]).values_list('chart_id', 'pk'))
+
+        Departments = TaskForce.departments.through
+        Members = TaskForce.members.through
+        self.insert(Departments, [
+            Departments(taskforce_id=pk_by_chart[chart_id], department_id=dept)
+            for chart_id, depts, _ in plans for dept in depts
+        ])
+        memberships = [
+            Members(taskforce_id=pk_by_chart[chart_id], user_id=user)
+            for chart_id, _, members in plans for user in members
+        ]
+        self.insert(Members, memberships)
+        self.stdout.write(f"Task forces: {count} ({len(memberships)} memberships)")
+        return [pk_by_chart[c] for c in chart_ids]
+
+    def create_audit_logs(self, count, staff, tf_ids):
+        """
+        Writes with executemany instead of bulk_create: at millions of rows,
+        building AuditLog instances costs more than the INSERT itself.
+        """
+        if not count:
+            return
+        actions = [(a, m) for a, m, _ in AUDIT_ACTIONS]
+        weights = [w for _, _, w in AUDIT_ACTIONS]
+        details = {a: f"{a.replace('_', ' ').title()} (demo)" for a, _ in actions}
+        actors = [pk for pks in staff.values() for pk in pks]
+        ips = [f"10.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randrange(1, 255)}" for _ in range(1000)]
+        end = timezone.now()
+        span = 365 * 24 * 3600  # One year of history, oldest first
+        step = span / count
+
+        ops = connection.ops
+        fields = [AuditLog._meta.get_field(name) for name in ('actor', 'action', 'target_model', 'target_id', 'details', 'ip_address', 'timestamp')]
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            ops.quote_name(AuditLog._meta.db_table),
+            ', '.join(ops.quote_name(f.column) for f in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+
+        written = 0
+        while written < count:
+            batch = min(self.batch_size, count - written)
+            # One choices() call per column per batch is much faster than per row
+            picks = self.rng.choices(actions, weights, k=batch)
+            batch_actors = self.rng.choices(actors, k=batch)
+            batch_targets = self.rng.choices(tf_ids or actors, k=batch)
+            batch_ips = self.rng.choices(ips, k=batch)
+            rows = []
+            for j in range(batch):
+                action, model = picks[j]
+                actor = batch_actors[j]
+                rows.append((
+                    actor, action, model,
+                    str(batch_targets[j] if model == 'TaskForce' else actor),
+                    details[action], batch_ips[j],
+                    ops.adapt_datetimefield_value(end - timedelta(seconds=span - (written + j) * step)),
+                ))
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            written += batch
+            if written % (self.batch_size * 20) == 0 or written == count:
+                self.stdout.write(f"Audit logs: {written}/{count}")
@@ -0,0 +1,54 @@
+import csv
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from accounts.models import User
+from dashboard.staff_import import StaffImportError, hash_worker_limit, read_rows, import_staff
+
+
+class Command(BaseCommand):
+    help = "Create staff accounts in bulk from a CSV or XLSX file (columns: username, first_name, last_name, email, role, department)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or XLSX file to import.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate every row without creating anything.")
+        parser.add_argument('--actor', help="Username recorded as the actor in the audit log.")
+        parser.add_argument('--workers', type=int, default=None, help="Password hashing processes (default and maximum: STAFF_IMPORT_HASH_WORKERS).")
+        parser.add_argument('--report', help="Write rejected rows and reasons to this CSV file.")
+
+    def handle(self, *args, **options):
+        actor = None
+        if options['actor']:
+            actor = User.objects.filter(username=options['actor']).first()
+            if actor is None:
+                raise CommandError(f"No user named '{options['actor']}'.")
+
+        try:
+            with open(options['path'], 'rb') as f:
+                rows = read_rows(f, options['path'])
+        except (OSError, StaffImportError) as e:
+            raise CommandError(str(e))
+
+        created, errors = import_staff(
+            rows,
+            actor=actor,
+            login_url=settings.SITE_URL.rstrip('/') + reverse('login'),
+            dry_run=options['dry_run'],
+            workers=options['workers'] or hash_worker_limit(),
+        )
+
+        for number, message in errors:
+            self.stderr.write(f"Row {number}: {message}")
+        if options['report'] and errors:
+            with open(options['report'], 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Row', 'Error'])
+                writer.writerows(errors)
+
+        valid = len(rows) - len(errors)
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Dry run: {valid} of {len(rows)} rows are valid, {len(errors)} rejected."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Created {len(created)} staff accounts, {len(errors)} rows rejected. Welcome emails are queued."))
@@ -4,6 +4,8 @@ from django.shortcuts import redirect
 from django.core.exceptions import PermissionDenied
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
+from tfms_core.replica import replica_reads
+from .profiling import template_timer
 
 class RoleRequiredMixin(AccessMixin):
     """
@@ -29,3 +31,18 @@ class RoleRequiredMixin(AccessMixin):
             raise PermissionDenied
         
         return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaReadMixin:
+    """
+    Runs a read-only view against the read replica (when one is configured).
+    The template is rendered inside too, since querysets are evaluated while rendering.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                # Rendered here, not by the handler, so the profiler needs telling
+                with template_timer(request):
+                    response.render()
+            return response
@@ -1,3 +1,22 @@
 from django.db import models
 
 # Create your models here.
+
+class RequestProfile(models.Model):
+    """One profiled request, stored when PROFILER_PERSIST is on (see dashboard.profiling)."""
+    view_name = models.CharField(max_length=200)
+    path = models.CharField(max_length=500)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    sql_ms = models.FloatField()
+    duplicate_queries = models.PositiveIntegerField(default=0)
+    template_ms = models.FloatField(default=0)
+    # The most repeated SQL statement (parameters stripped) and how often it ran; points at N+1 loops
+    top_statement = models.TextField(blank=True)
+    top_statement_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.method} {self.path} - {self.duration_ms}ms, {self.query_count} queries"
@@ -0,0 +1,209 @@
+"""
+Opt-in request profiler.
+
+RequestProfilerMiddleware measures each sampled request: wall time, SQL query
+count and time, repeated queries, template render time and the resolved view
+name. Records go into a bounded in-memory ring buffer (per process) and,
+with PROFILER_PERSIST, into the RequestProfile table in batches so every
+worker's requests show up in the viewer (dashboard:profiler). The table is
+trimmed to the newest PROFILER_BUFFER_SIZE rows (all the viewer reads) after
+each batch.
+
+Template time is measured around TemplateResponse rendering. Views that render
+inside dispatch (ReplicaReadMixin) report it through template_timer().
+
+A request that runs more than PROFILER_QUERY_WARNING_THRESHOLD queries is
+logged as a warning together with its SQL.
+
+Settings (all optional):
+    PROFILER_ENABLED                    False   middleware is removed at startup when off
+    PROFILER_SAMPLE_RATE                1.0     fraction of requests profiled
+    PROFILER_BUFFER_SIZE                500     records kept in memory
+    PROFILER_PERSIST                    False   also store records in the database
+    PROFILER_PERSIST_BATCH              20      records per INSERT when persisting
+    PROFILER_QUERY_WARNING_THRESHOLD    50      0 disables the warning
+"""
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.models import Subquery
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffer = deque(maxlen=getattr(settings, 'PROFILER_BUFFER_SIZE', 500))
+_pending = []  # Waiting to be persisted
+
+FIELDS = (
+    'view_name', 'path', 'method', 'status_code', 'duration_ms', 'query_count', 'sql_ms',
+    'duplicate_queries', 'template_ms', 'top_statement', 'top_statement_count',
+)
+
+
+def records():
+    """
+    Profile records, newest first: from the database when persisting (plus this
+    process's records not yet written), else this process's buffer.
+    """
+    if getattr(settings, 'PROFILER_PERSIST', False):
+        from .models import RequestProfile
+        with _lock:
+            pending = list(reversed(_pending))
+        stored = RequestProfile.objects.order_by('-id').values(*FIELDS)[:max(_buffer.maxlen - len(pending), 0)]
+        return pending + list(stored)
+    with _lock:
+        return list(reversed(_buffer))
+
+
+def clear():
+    with _lock:
+        _buffer.clear()
+        _pending.clear()
+    if getattr(settings, 'PROFILER_PERSIST', False):
+        from .models import RequestProfile
+        RequestProfile.objects.all().delete()
+
+
+def summarize(rows):
+    """Groups records by view name. Returns one dict per endpoint."""
+    endpoints = {}
+    for row in rows:
+        entry = endpoints.setdefault(row['view_name'], {
+            'view_name': row['view_name'], 'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'total_queries': 0, 'max_queries': 0, 'total_sql_ms': 0.0, 'total_template_ms': 0.0,
+            'duplicate_queries': 0,
+        })
+        entry['requests'] += 1
+        entry['total_ms'] += row['duration_ms']
+        entry['max_ms'] = max(entry['max_ms'], row['duration_ms'])
+        entry['total_queries'] += row['query_count']
+        entry['max_queries'] = max(entry['max_queries'], row['query_count'])
+        entry['total_sql_ms'] += row['sql_ms']
+        entry['total_template_ms'] += row['template_ms']
+        entry['duplicate_queries'] += row['duplicate_queries']
+
+    for entry in endpoints.values():
+        n = entry['requests']
+        entry['avg_ms'] = entry['total_ms'] / n
+        entry['avg_queries'] = entry['total_queries'] / n
+        entry['avg_sql_ms'] = entry['total_sql_ms'] / n
+        entry['avg_template_ms'] = entry['total_template_ms'] / n
+    return list(endpoints.values())
+
+
+def _store(record):
+    persist = getattr(settings, 'PROFILER_PERSIST', False)
+    with _lock:
+        _buffer.append(record)
+        if not persist:
+            return
+        _pending.append(record)
+        if len(_pending) < getattr(settings, 'PROFILER_PERSIST_BATCH', 20):
+            return
+        batch = _pending[:]
+        _pending.clear()
+
+    from .models import RequestProfile
+    try:
+        RequestProfile.objects.bulk_create([RequestProfile(**r) for r in batch])
+        # Keep only what records() can show; older rows would just pile up
+        oldest_kept = RequestProfile.objects.order_by('-id').values_list('id', flat=True)[_buffer.maxlen - 1:_buffer.maxlen]
+        RequestProfile.objects.filter(id__lt=Subquery(oldest_kept)).delete()
+    except Exception:
+        # Profiling must never break the request it measured
+        logger.exception("Error saving %d request profiles", len(batch))
+
+
+@contextmanager
+def template_timer(request):
+    """Adds the time spent in the block to the request's template time (when it is profiled)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if hasattr(request, '_profiler_template_ms'):
+            request._profiler_template_ms += (time.perf_counter() - started) * 1000
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper callback that times every statement."""
+    def __init__(self):
+        self.queries = []  # (sql, params, seconds)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - start))
+
+
+class RequestProfilerMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= getattr(settings, 'PROFILER_SAMPLE_RATE', 1.0):
+            return self.get_response(request)
+
+        recorder = _QueryRecorder()
+        request._profiler_template_ms = 0.0
+        start = time.perf_counter()
+        wrappers = [connection.execute_wrapper(recorder) for connection in connections.all()]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+        duration = time.perf_counter() - start
+
+        # Streaming responses are measured up to the first byte only
+        match = getattr(request, 'resolver_match', None)
+        statements = Counter(sql for sql, _, _ in recorder.queries)
+        exact = Counter((sql, repr(params)) for sql, params, _ in recorder.queries)
+        record = {
+            'view_name': (match.view_name if match else None) or request.path,
+            'path': request.get_full_path()[:500],
+            'method': request.method,
+            'status_code': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'query_count': len(recorder.queries),
+            'sql_ms': round(sum(t for _, _, t in recorder.queries) * 1000, 2),
+            'duplicate_queries': sum(n - 1 for n in exact.values()),
+            'template_ms': round(request._profiler_template_ms, 2),
+            'top_statement': statements.most_common(1)[0][0][:1000] if statements else '',
+            'top_statement_count': statements.most_common(1)[0][1] if statements else 0,
+        }
+        _store(record)
+
+        threshold = getattr(settings, 'PROFILER_QUERY_WARNING_THRESHOLD', 50)
+        if threshold and len(recorder.queries) > threshold:
+            logger.warning(
+                "%s %s (%s) ran %d queries (threshold %d):\n%s",
+                request.method, request.path, record['view_name'], len(recorder.queries), threshold,
+                '\n'.join(f"  [{t * 1000:.1f}ms] {sql} {params!r}" for sql, params, t in recorder.queries),
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # Runs just before TemplateResponse.render(); time it with a post-render callback.
+        # A response already rendered by the view runs the callback at once (adding ~0).
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._profiler_template_ms += (time.perf_counter() - started) * 1000
+
+        if hasattr(request, '_profiler_template_ms'):
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+from university.models import Department, TaskForce
+from . import counters
+
+# Dashboard counters: mark them outdated once the change is committed,
+# so a rolled-back write never throws the cached numbers away.
+
+@receiver(post_save, sender=TaskForce)
+@receiver(post_delete, sender=TaskForce)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=User)
+def invalidate_dashboard_counters(sender, **kwargs):
+    transaction.on_commit(counters.invalidate)
+
+@receiver(post_save, sender=User)
+def invalidate_dashboard_counters_on_user_save(sender, update_fields=None, **kwargs):
+    # Every login saves last_login; that does not change any count
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(counters.invalidate)
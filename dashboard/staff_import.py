@@ -0,0 +1,217 @@
+"""
+Bulk staff onboarding, shared by `manage.py import_staff` and StaffImportView.
+
+Rows are validated with StaffForm's rules, then created in chunks: one
+bulk_create per chunk for users, welcome emails (EmailOutbox) and audit
+entries. `manage.py import_staff` spreads temporary-password hashing across
+a process pool of up to STAFF_IMPORT_HASH_WORKERS processes; the web upload
+hashes in the request process and is limited to STAFF_IMPORT_WEB_MAX_ROWS
+new accounts per upload.
+"""
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from django import forms
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.crypto import get_random_string
+from django.utils.html import strip_tags
+
+from accounts import audit
+from accounts.models import User, EmailOutbox
+from accounts.utils import get_client_ip
+from university.cache import get_departments
+from . import counters
+from .forms import StaffForm
+
+COLUMNS = ['username', 'first_name', 'last_name', 'email', 'role', 'department']
+CHUNK_SIZE = 500
+
+
+class StaffImportError(Exception):
+    """The file itself cannot be read (bad format, missing columns, ...)."""
+
+
+def read_rows(fileobj, filename):
+    """Returns the rows of a CSV or XLSX upload as dicts keyed by lower-cased header."""
+    if filename.lower().endswith('.xlsx'):
+        try:
+            import openpyxl
+        except ImportError:
+            raise StaffImportError("Reading .xlsx files requires openpyxl (pip install openpyxl). Save the sheet as CSV instead.")
+        sheet = openpyxl.load_workbook(fileobj, read_only=True, data_only=True).active
+        values = sheet.iter_rows(values_only=True)
+        header = [str(h or '').strip().lower() for h in next(values, [])]
+        rows = [
+            {header[i]: ('' if v is None else str(v).strip()) for i, v in enumerate(row) if i < len(header)}
+            for row in values if any(v not in (None, '') for v in row)
+        ]
+    else:
+        content = fileobj.read()
+        if isinstance(content, bytes):
+            content = content.decode('utf-8-sig')
+        reader = csv.DictReader(io.StringIO(content))
+        header = [(h or '').strip().lower() for h in (reader.fieldnames or [])]
+        rows = [
+            {(k or '').strip().lower(): (v or '').strip() for k, v in row.items()}
+            for row in reader if any((v or '').strip() for v in row.values())
+        ]
+
+    missing = [c for c in COLUMNS if c not in header]
+    if missing:
+        raise StaffImportError(f"Missing column(s): {', '.join(missing)}. Expected: {', '.join(COLUMNS)}.")
+    return rows
+
+
+class CachedDepartmentField(forms.ModelChoiceField):
+    """Resolves departments by id or name from the reference-data cache instead of one query per row."""
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        value = str(value).strip()
+        dept = next((d for d in get_departments() if str(d.pk) == value or d.name.lower() == value.lower()), None)
+        if dept is None:
+            raise forms.ValidationError(f"Unknown department '{value}'.", code='invalid_choice')
+        return dept
+
+    def validate(self, value):
+        forms.Field.validate(self, value)
+
+
+class StaffImportForm(StaffForm):
+    """
+    StaffForm for one import row. Uniqueness and department existence are
+    checked in bulk by import_staff, so the form itself runs no queries.
+    """
+    department = CachedDepartmentField(queryset=StaffForm.base_fields['department'].queryset, required=False)
+
+    def __init__(self, *args, **kwargs):
+        forms.ModelForm.__init__(self, *args, **kwargs)
+
+    def validate_unique(self):
+        pass
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        exclude.add('department')
+        return exclude
+
+
+def _init_hash_worker():
+    # Forked workers inherit a configured Django; spawned ones (macOS/Windows) must set it up
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def hash_worker_limit():
+    return max(1, getattr(settings, 'STAFF_IMPORT_HASH_WORKERS', 4))
+
+
+def hash_passwords(raw_passwords, workers=1):
+    """
+    Hashes passwords, in-process by default. workers > 1 (capped at
+    STAFF_IMPORT_HASH_WORKERS) uses a process pool; only the management command
+    asks for that, never a web request.
+    """
+    workers = min(workers or 1, hash_worker_limit())
+    if workers == 1 or len(raw_passwords) < 2:
+        return [make_password(p) for p in raw_passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+        return list(pool.map(make_password, raw_passwords, chunksize=max(1, len(raw_passwords) // (workers * 4))))
+
+
+def import_staff(rows, actor=None, login_url='', dry_run=False, workers=1, request=None):
+    """
+    Validates and creates staff accounts.
+    workers: password hashing processes (see hash_passwords).
+    Returns (created_users, errors) where errors is a list of (row_number, message).
+    Row numbers count the header as row 1, matching what spreadsheets show.
+    """
+    errors = []
+    valid = []
+    seen_usernames = set()
+
+    # One query for every username already taken
+    usernames = [row.get('username', '') for row in rows]
+    taken = set()
+    for i in range(0, len(usernames), CHUNK_SIZE):
+        taken.update(User.objects.filter(username__in=usernames[i:i + CHUNK_SIZE]).values_list('username', flat=True))
+
+    for number, row in enumerate(rows, start=2):
+        data = {column: row.get(column, '') for column in COLUMNS}
+        data['role'] = data['role'].upper()
+        form = StaffImportForm(data=data)
+        if not form.is_valid():
+            messages = [f"{field}: {' '.join(errs)}" if field != '__all__' else ' '.join(errs) for field, errs in form.errors.items()]
+            errors.append((number, '; '.join(messages)))
+            continue
+        username = form.cleaned_data['username']
+        if username in taken or username in seen_usernames:
+            errors.append((number, f"username: '{username}' already exists."))
+            continue
+        seen_usernames.add(username)
+        valid.append(form.cleaned_data)
+
+    if dry_run or not valid:
+        return [], errors
+
+    ip = get_client_ip(request) if request else None
+    all_passwords = [get_random_string(10) for _ in valid]
+    all_hashed = hash_passwords(all_passwords, workers=workers)
+
+    created = []
+    for start in range(0, len(valid), CHUNK_SIZE):
+        chunk = valid[start:start + CHUNK_SIZE]
+        temp_passwords = all_passwords[start:start + CHUNK_SIZE]
+        hashed = all_hashed[start:start + CHUNK_SIZE]
+        needs_id = sum(1 for data in chunk if data['role'] != User.Role.ADMIN)
+        staff_ids = iter(User.reserve_staff_ids(needs_id) if needs_id else [])
+
+        users = []
+        for data, password in zip(chunk, hashed):
+            users.append(User(
+                username=data['username'],
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                email=data['email'],
+                role=data['role'],
+                department=data['department'],
+                staff_id=next(staff_ids) if data['role'] != User.Role.ADMIN else None,
+                password=password,
+                must_change_password=True,
+            ))
+
+        with transaction.atomic(), audit.buffered():
+            users = User.objects.bulk_create(users)
+            # Look the ids up again: not every backend returns them from bulk_create
+            ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'pk'))
+
+            outbox = []
+            for user, temp_password in zip(users, temp_passwords):
+                user.pk = ids[user.username]
+                html_message = render_to_string('email/account_created.html', {
+                    'user': user, 'temp_password': temp_password, 'login_url': login_url,
+                })
+                outbox.append(EmailOutbox(
+                    subject="Welcome to Task Force Management System",
+                    body=strip_tags(html_message),
+                    html_body=html_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipients=[user.email],
+                    sensitive=True,
+                ))
+                audit.record(
+                    actor=actor, action="CREATE_USER", target_model="User", target_id=str(user.pk),
+                    details=f"Created user {user.username} (bulk import)",
+                    ip_address=ip,
+                )
+            EmailOutbox.objects.bulk_create(outbox)
+        created.extend(users)
+
+    counters.invalidate()  # bulk_create sends no post_save
+    return created, errors
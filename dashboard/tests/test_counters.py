@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from dashboard import counters
+from tfms_core import replica
+
+
+class CachedCounterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.loads = []
+
+    def loader(self):
+        # Records whether the router would have sent this load to the replica
+        self.loads.append(replica._use_replica.get())
+        return len(self.loads)
+
+    def test_counters_are_cached_until_invalidated(self):
+        self.assertEqual(counters._cached('test', self.loader), 1)
+        self.assertEqual(counters._cached('test', self.loader), 1)
+        counters.invalidate()
+        self.assertEqual(counters._cached('test', self.loader), 2)
+
+    def test_reloads_after_invalidation_use_the_primary(self):
+        counters._cached('test', self.loader)
+        counters.invalidate()
+        with replica.replica_reads():
+            counters._cached('test', self.loader)
+        self.assertEqual(self.loads, [False, False])
+
+    def test_expired_entries_reload_from_the_replica(self):
+        counters._cached('test', self.loader)
+        key = 'dashboard:counters:test'
+        entry = cache.get(key)
+        entry['fresh_until'] = 0
+        cache.set(key, entry)
+        counters._cached('test', self.loader)
+        self.assertEqual(self.loads, [False, True])
+
+    def test_stale_entry_is_served_while_another_request_refreshes(self):
+        counters._cached('test', self.loader)
+        counters.invalidate()
+        cache.add('dashboard:counters:test:refresh', 1)  # Someone else is recomputing
+        self.assertEqual(counters._cached('test', self.loader), 1)
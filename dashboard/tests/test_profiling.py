@@ -0,0 +1,62 @@
+from collections import deque
+from unittest import mock
+
+from django.core.cache import cache
+from django.template.response import TemplateResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from dashboard import profiling
+from dashboard.models import RequestProfile
+
+
+def record(n):
+    return {
+        'view_name': f'view{n}', 'path': '/', 'method': 'GET', 'status_code': 200, 'duration_ms': 1.0,
+        'query_count': 1, 'sql_ms': 0.1, 'duplicate_queries': 0, 'template_ms': 0.0,
+        'top_statement': '', 'top_statement_count': 0,
+    }
+
+
+class ProfilerStoreTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.multiple(profiling, _buffer=deque(maxlen=3), _pending=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(PROFILER_PERSIST=True, PROFILER_PERSIST_BATCH=2)
+    def test_persisted_rows_are_trimmed_to_the_buffer_size(self):
+        for n in range(6):
+            profiling._store(record(n))
+        self.assertEqual(
+            list(RequestProfile.objects.order_by('id').values_list('view_name', flat=True)),
+            ['view3', 'view4', 'view5'],
+        )
+        self.assertEqual([r['view_name'] for r in profiling.records()], ['view5', 'view4', 'view3'])
+
+
+@override_settings(PROFILER_ENABLED=True, PROFILER_SAMPLE_RATE=1.0, PROFILER_PERSIST=False, AUDIT_LOG_SYNC=True)
+class ProfilerTemplateTimeTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.multiple(profiling, _buffer=deque(maxlen=10), _pending=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_login(User.objects.create(username='admin1', role=User.Role.ADMIN))
+
+    def test_views_rendering_inside_dispatch_report_template_time(self):
+        # AuditLogListView uses ReplicaReadMixin, which renders before the middleware sees the response
+        real_render = TemplateResponse.render
+
+        def render(response):
+            clock.append(clock[-1] + 0.25)
+            return real_render(response)
+
+        clock = [0.0]
+        with mock.patch.object(TemplateResponse, 'render', render), \
+                mock.patch('dashboard.profiling.time.perf_counter', lambda: clock[-1]):
+            self.client.get(reverse('dashboard:audit_log_list'))
+        self.assertGreaterEqual(profiling.records()[0]['template_ms'], 250)
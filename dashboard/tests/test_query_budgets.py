@@ -0,0 +1,227 @@
+"""
+Query-count budgets for every route in dashboard/urls.py and accounts/urls.py.
+
+Each route is requested as the role that uses it, once with SMALL rows of
+data and again after growing the data to LARGE rows. The number of queries
+must be the same at both sizes (no N+1) and within the route's budget.
+Failures print the SQL of the offending request.
+
+Run with: python manage.py test dashboard
+"""
+import time
+import unittest
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.middleware import LowWriteSessionMiddleware
+from accounts.models import User, AuditLog
+from university.models import Department, TaskForce, WorkloadSettings
+from university.services import WorkloadService
+
+SMALL = 10
+LARGE = 1000
+
+# (url name, HTTP method, role, url kwargs fixture, POST data, query budget)
+# The kwargs fixture names an attribute set in setUpTestData; POST data may be
+# a function of the test case for data that needs fixture ids.
+ROUTES = [
+    # accounts/urls.py
+    ('login', 'get', None, None, None, 0),
+    ('force_password_change', 'get', 'lecturer', None, None, 3),
+    ('logout', 'post', 'lecturer', None, None, 5),
+
+    # dashboard/urls.py
+    ('dashboard:home', 'get', 'admin', None, None, 2),
+    ('dashboard:audit_log_list', 'get', 'admin', None, None, 4),
+    ('dashboard:admin', 'get', 'admin', None, None, 3),
+    ('dashboard:staff_list', 'get', 'admin', None, None, 3),
+    ('dashboard:staff_add', 'get', 'admin', None, None, 3),
+    ('dashboard:staff_import', 'get', 'admin', None, None, 2),
+    ('dashboard:staff_edit', 'get', 'admin', 'staff_target', None, 4),
+    ('dashboard:staff_unlock', 'post', 'admin', 'staff_target', {}, 5),
+    ('dashboard:staff_deactivate', 'post', 'admin', 'staff_target', {'justification': 'Left the faculty'}, 5),
+    ('dashboard:staff_activate', 'post', 'admin', 'staff_target', {}, 5),
+    ('dashboard:staff_reset_password', 'post', 'admin', 'staff_target', {}, 5),
+    ('dashboard:taskforce_list', 'get', 'admin', None, None, 5),
+    ('dashboard:taskforce_add', 'get', 'admin', None, None, 4),
+    ('dashboard:taskforce_edit', 'get', 'admin', 'draft_taskforce', None, 6),
+    ('dashboard:department_list', 'get', 'admin', None, None, 3),
+    ('dashboard:department_add', 'get', 'admin', None, None, 2),
+    ('dashboard:department_edit', 'get', 'admin', 'home_department', None, 3),
+    ('dashboard:workload_settings', 'get', 'admin', None, None, 3),
+    ('dashboard:profiler', 'get', 'admin', None, None, 2),
+    ('dashboard:staff_list_api', 'get', 'hod', None, None, 7),
+    ('dashboard:roster_simulation_api', 'post', 'hod', 'draft_taskforce',
+     lambda t: {'add': str(t.candidate.pk), 'remove': str(t.staff_target.pk)}, 6),
+    ('dashboard:roster_suggestion_api', 'get', 'hod', 'draft_taskforce', {'headcount': '5'}, 5),
+    ('dashboard:hod', 'get', 'hod', None, None, 6),
+    ('dashboard:hod_taskforce_list', 'get', 'hod', None, None, 6),
+    ('dashboard:hod_taskforce_manage', 'get', 'hod', 'draft_taskforce', None, 8),
+    ('dashboard:psm', 'get', 'psm', None, None, 2),
+    ('dashboard:psm_taskforce_list', 'get', 'psm', None, None, 5),
+    ('dashboard:psm_taskforce_review', 'get', 'psm', 'submitted_taskforce', None, 9),
+    ('dashboard:psm_taskforce_modify', 'get', 'psm', 'submitted_taskforce', None, 7),
+    ('dashboard:psm_taskforce_actioned_list', 'get', 'psm', None, None, 5),
+    ('dashboard:psm_taskforce_actioned_detail', 'get', 'psm', 'approved_taskforce', None, 7),
+    ('dashboard:dean', 'get', 'dean', None, None, 2),
+    ('dashboard:dean_reports', 'get', 'dean', None, None, 4),
+    ('dashboard:lecturer', 'get', 'lecturer', None, None, 4),
+    ('dashboard:lecturer_portfolio', 'get', 'lecturer', None, None, 6),
+]
+
+# Routes whose query count still grows with the data. Listed here so the
+# suite stays green while they are fixed; remove an entry once it passes
+# (the test then reports an unexpected success).
+KNOWN_UNBOUNDED = set()
+
+
+@override_settings(AUDIT_LOG_SYNC=True)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        WorkloadSettings.objects.create(min_weightage=0, max_weightage=30)
+        cls.home_department = Department.objects.create(name='Computer Science')
+        cls.other_department = Department.objects.create(name='Electrical Engineering')
+
+        cls.users = {
+            'admin': User.objects.create(username='admin1', role=User.Role.ADMIN, email='admin1@example.com'),
+            'hod': User.objects.create(username='hod1', role=User.Role.HOD, department=cls.home_department, email='hod1@example.com'),
+            'psm': User.objects.create(username='psm1', role=User.Role.PSM, email='psm1@example.com'),
+            'dean': User.objects.create(username='dean1', role=User.Role.DEAN, email='dean1@example.com'),
+            'lecturer': User.objects.create(username='lecturer1', role=User.Role.LECTURER, department=cls.home_department, email='lecturer1@example.com'),
+        }
+        cls.staff_target = User.objects.create(username='target1', role=User.Role.LECTURER, department=cls.home_department, email='target1@example.com')
+        cls.candidate = User.objects.create(username='candidate1', role=User.Role.LECTURER, department=cls.home_department, email='candidate1@example.com')
+
+        cls.draft_taskforce = cls.make_taskforce('Draft TF', 'DRAFT')
+        cls.submitted_taskforce = cls.make_taskforce('Submitted TF', 'SUBMITTED')
+        cls.approved_taskforce = cls.make_taskforce('Approved TF', 'APPROVED', assigned_psm=cls.users['psm'])
+
+        cls.grow(SMALL)
+
+    @classmethod
+    def make_taskforce(cls, name, status, **kwargs):
+        tf = TaskForce.objects.create(name=name, status=status, weightage=5, submitted_by=cls.users['hod'], **kwargs)
+        tf.departments.add(cls.home_department)
+        tf.members.add(cls.users['lecturer'], cls.staff_target)
+        return tf
+
+    @classmethod
+    def grow(cls, target):
+        """
+        Bulk-adds staff, task forces, memberships and audit entries until there are
+        `target` of each, plus one department per ten task forces.
+        """
+        start = TaskForce.objects.filter(name__startswith='Bulk TF').count()
+        count = target - start
+        if count <= 0:
+            return
+
+        Department.objects.bulk_create([Department(name=f'Bulk Department {start + i}') for i in range(0, count, 10)])
+        departments = [cls.home_department, cls.other_department] + list(Department.objects.filter(name__startswith='Bulk Department'))
+        cache.clear()  # bulk_create skips the signal that invalidates cached departments
+
+        staff_ids = User.reserve_staff_ids(count)
+        staff = User.objects.bulk_create([
+            User(
+                username=f'bulk{start + i}', email=f'bulk{start + i}@example.com', role=User.Role.LECTURER,
+                department=cls.home_department if i % 2 else departments[i % len(departments)], staff_id=staff_ids[i],
+            )
+            for i in range(count)
+        ])
+        staff = list(User.objects.filter(username__in=[u.username for u in staff]))
+
+        statuses = [status for status, _ in TaskForce.STATUS_CHOICES]
+        chart_ids = TaskForce.reserve_chart_ids(count)
+        TaskForce.objects.bulk_create([
+            TaskForce(
+                name=f'Bulk TF {start + i}', chart_id=chart_ids[i], status=statuses[i % len(statuses)],
+                weightage=1 + i % 5, submitted_by=cls.users['hod'],
+                assigned_psm=cls.users['psm'] if i % 2 else None,
+            )
+            for i in range(count)
+        ])
+        taskforces = list(TaskForce.objects.filter(chart_id__in=chart_ids))
+
+        Departments = TaskForce.departments.through
+        Members = TaskForce.members.through
+        Departments.objects.bulk_create(
+            [Departments(taskforce=tf, department=cls.home_department) for tf in taskforces]
+            + [Departments(taskforce=tf, department=departments[1 + i % (len(departments) - 1)]) for i, tf in enumerate(taskforces)]
+        )
+        Members.objects.bulk_create(
+            [Members(taskforce=tf, user=cls.users['lecturer']) for tf in taskforces]
+            + [Members(taskforce=tf, user=staff[i]) for i, tf in enumerate(taskforces)]
+            + [Members(taskforce=tf, user=staff[(i + 1) % count]) for i, tf in enumerate(taskforces)]
+        )
+        WorkloadService.refresh_ledger([u.pk for u in staff] + [cls.users['lecturer'].pk])
+
+        AuditLog.objects.bulk_create([
+            AuditLog(actor=cls.users['admin'], action='UPDATE_TASKFORCE', target_model='TaskForce', target_id=str(tf.pk), details='seed')
+            for tf in taskforces
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, role):
+        self.client.force_login(self.users[role])
+        # Stamp the session as its first request would, so no measured request pays for that save
+        session = self.client.session
+        session[LowWriteSessionMiddleware.REFRESHED_KEY] = int(time.time())
+        session.save()
+
+    def request(self, name, method, role, fixture, data):
+        kwargs = {'pk': getattr(self, fixture).pk} if fixture else {}
+        if callable(data):
+            data = data(self)
+        url = reverse(name, kwargs=kwargs)
+        if role:
+            self.login(role)
+        # Warm the reference-data cache so both runs measure the same steady state. The
+        # warm-up's writes are rolled back and the login restored, so routes that change
+        # state (logout, unlock, deactivate, ...) are measured from the same starting point.
+        with transaction.atomic():
+            getattr(self.client, method)(url, data or {})
+            transaction.set_rollback(True)
+        if role and '_auth_user_id' not in self.client.session:
+            self.login(role)
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, data or {})
+        self.assertLess(response.status_code, 400, f"{method.upper()} {url} returned {response.status_code}")
+        return ctx.captured_queries
+
+    def assertQueryBudget(self, name, method, role, fixture, data, budget):
+        small = self.request(name, method, role, fixture, data)
+        self.grow(LARGE)
+        large = self.request(name, method, role, fixture, data)
+
+        def dump(queries):
+            return '\n'.join(f"  {i}. {q['sql']}" for i, q in enumerate(queries, start=1))
+
+        self.assertEqual(
+            len(small), len(large),
+            f"{name}: {len(small)} queries with {SMALL} rows but {len(large)} with {LARGE} rows.\n"
+            f"Queries with {LARGE} rows:\n{dump(large)}"
+        )
+        self.assertLessEqual(
+            len(large), budget,
+            f"{name}: {len(large)} queries, budget is {budget}.\nQueries:\n{dump(large)}"
+        )
+
+
+def _make_test(route):
+    def test(self):
+        self.assertQueryBudget(*route)
+    if route[0] in KNOWN_UNBOUNDED:
+        test = unittest.expectedFailure(test)
+    return test
+
+
+for _route in ROUTES:
+    setattr(QueryBudgetTests, 'test_' + _route[0].replace('dashboard:', '').replace(':', '_'), _make_test(_route))
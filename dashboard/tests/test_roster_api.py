@@ -0,0 +1,96 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from university.models import Department, TaskForce, WorkloadSettings
+from university.services import WorkloadService
+
+
+@override_settings(AUDIT_LOG_SYNC=True, THROTTLE_ENABLED=False)
+class RosterApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        WorkloadSettings.objects.create(min_weightage=0, max_weightage=10)
+        cls.cs = Department.objects.create(name='Computer Science')
+        cls.ee = Department.objects.create(name='Electrical Engineering')
+        cls.hod = User.objects.create(username='hod1', role=User.Role.HOD, department=cls.cs)
+
+        def lecturer(username, department):
+            return User.objects.create(username=username, first_name=username.title(), role=User.Role.LECTURER, department=department)
+
+        cls.member = lecturer('member', cls.cs)
+        cls.idle = lecturer('idle', cls.cs)
+        cls.busy = lecturer('busy', cls.cs)
+        cls.full = lecturer('full', cls.cs)
+        cls.outsider = lecturer('outsider', cls.ee)
+
+        cls.taskforce = TaskForce.objects.create(name='Planned', status='DRAFT', weightage=3, submitted_by=cls.hod)
+        cls.taskforce.departments.add(cls.cs)
+        cls.taskforce.members.add(cls.member)
+        for user, weightage in [(cls.member, 2), (cls.busy, 4), (cls.full, 9)]:
+            other = TaskForce.objects.create(name=f'Other {user.username}', status='ACTIVE', weightage=weightage, submitted_by=cls.hod)
+            other.departments.add(cls.cs)
+            other.members.add(user)
+        WorkloadService.refresh_ledger(User.objects.values_list('pk', flat=True))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.hod)
+
+    def simulate(self, **body):
+        url = reverse('dashboard:roster_simulation_api', kwargs={'pk': self.taskforce.pk})
+        return self.client.post(url, json.dumps(body), content_type='application/json')
+
+    def test_after_reports_the_post_change_totals(self):
+        response = self.simulate(add=[self.idle.pk], remove=[self.member.pk], pool=False)
+        self.assertEqual(response.status_code, 200)
+        staff = {row['id']: row for row in response.json()['staff']}
+        self.assertEqual(response.json()['members'], [self.idle.pk])
+
+        # Member: 2 elsewhere + 3 here before; 2 after leaving
+        self.assertEqual(staff[self.member.pk]['before']['current_weightage'], 5)
+        self.assertEqual(staff[self.member.pk]['after']['current_weightage'], 2)
+        self.assertEqual(staff[self.idle.pk]['after']['current_weightage'], 3)
+        self.assertEqual(staff[self.member.pk]['if_added']['predicted_weightage'], 5)
+
+    def test_uncounted_task_force_changes_nobody_s_load(self):
+        TaskForce.objects.filter(pk=self.taskforce.pk).update(status='REJECTED')
+        WorkloadService.refresh_ledger([self.member.pk])
+        data = self.simulate(add=[self.full.pk], weightage=8).json()
+        self.assertFalse(data['taskforce']['counted'])
+        self.assertEqual(data['overloaded'], [])
+        for row in data['staff']:
+            self.assertEqual(row['after']['current_weightage'], row['before']['current_weightage'])
+            if 'if_added' in row:
+                self.assertEqual(row['if_added']['predicted_weightage'], row['before']['current_weightage'])
+
+    def test_pool_reports_if_added_for_candidates_only(self):
+        staff = {row['id']: row for row in self.simulate().json()['staff']}
+        self.assertEqual(set(staff), {self.member.pk, self.idle.pk, self.busy.pk, self.full.pk})
+        self.assertEqual(staff[self.busy.pk]['if_added']['predicted_weightage'], 7)
+        self.assertEqual(staff[self.full.pk]['if_added']['status'], 'OVERLOADED')
+
+    def test_adding_someone_outside_the_pool_is_rejected(self):
+        for user in (self.outsider, self.hod):
+            response = self.simulate(add=[user.pk])
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['ids'], [user.pk])
+
+    def test_removing_a_non_member_is_rejected(self):
+        response = self.simulate(remove=[self.idle.pk])
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_departments_cannot_be_pooled(self):
+        self.assertEqual(self.simulate(department_ids=[self.ee.pk]).status_code, 400)
+
+    def test_suggestions_are_least_loaded_first_and_skip_overloads(self):
+        url = reverse('dashboard:roster_suggestion_api', kwargs={'pk': self.taskforce.pk})
+        data = self.client.get(url, {'headcount': 4}).json()
+        # 'full' (9 + 3 > 10) is never suggested, so one place stays open
+        self.assertEqual([s['id'] for s in data['suggestions']], [self.idle.pk, self.busy.pk])
+        self.assertEqual(data['shortfall'], 1)
+        self.assertEqual(data['suggestions'][1]['predicted_weightage'], 7)
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from university.models import Department, TaskForce, WorkloadSettings
+
+
+@override_settings(AUDIT_LOG_SYNC=True, THROTTLE_ENABLED=False)
+class StaffListEtagTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        WorkloadSettings.objects.create(min_weightage=0, max_weightage=10)
+        cls.department = Department.objects.create(name='Computer Science')
+        cls.hod = User.objects.create(username='hod1', role=User.Role.HOD, department=cls.department)
+        cls.lecturer = User.objects.create(username='lect1', first_name='Ada', role=User.Role.LECTURER, department=cls.department)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.hod)
+        self.url = reverse('dashboard:staff_list_api')
+
+    def get(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(self.url, {'department_id': self.department.pk}, **headers)
+
+    def test_unchanged_roster_returns_304(self):
+        etag = self.get()['ETag']
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_membership_change_produces_a_new_etag(self):
+        etag = self.get()['ETag']
+        taskforce = TaskForce.objects.create(name='TF', status='ACTIVE', weightage=3, submitted_by=self.hod)
+        taskforce.members.add(self.lecturer)
+        self.assertEqual(self.get(etag).status_code, 200)
+
+    def test_profile_edit_produces_a_new_etag(self):
+        etag = self.get()['ETag']
+        self.lecturer.first_name = 'Grace'
+        self.lecturer.save()
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Grace', response.content.decode())
+
+    def test_threshold_change_produces_a_new_etag(self):
+        etag = self.get()['ETag']
+        WorkloadSettings.objects.update(max_weightage=20)
+        cache.clear()  # update() skips the signal that drops the cached settings
+        self.assertEqual(self.get(etag).status_code, 200)
@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import EmailOutbox, User
+from dashboard import staff_import
+from university.models import Department
+
+HEADER = 'username,first_name,last_name,email,role,department\n'
+
+
+def csv_upload(count):
+    rows = ''.join(f'new{i},New,Staff{i},new{i}@example.com,LECTURER,Computer Science\n' for i in range(count))
+    return SimpleUploadedFile('staff.csv', (HEADER + rows).encode(), content_type='text/csv')
+
+
+@override_settings(AUDIT_LOG_SYNC=True, STAFF_IMPORT_WEB_MAX_ROWS=3, STAFF_IMPORT_HASH_WORKERS=2)
+class StaffImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Department.objects.create(name='Computer Science')
+        cls.admin = User.objects.create(username='admin1', role=User.Role.ADMIN, email='admin1@example.com')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def upload(self, count, dry_run=False):
+        data = {'file': csv_upload(count)}
+        if dry_run:
+            data['dry_run'] = 'on'
+        return self.client.post(reverse('dashboard:staff_import'), data)
+
+    def test_upload_hashes_in_the_request_process(self):
+        with mock.patch.object(staff_import, 'ProcessPoolExecutor') as pool:
+            self.upload(2)
+        pool.assert_not_called()
+        self.assertEqual(User.objects.filter(username__startswith='new').count(), 2)
+        self.assertTrue(all(EmailOutbox.objects.values_list('sensitive', flat=True)))
+
+    def test_uploads_over_the_limit_are_refused(self):
+        response = self.upload(4)
+        self.assertContains(response, 'at most 3 accounts')
+        self.assertFalse(User.objects.filter(username__startswith='new').exists())
+
+    def test_dry_runs_are_not_limited(self):
+        response = self.upload(4, dry_run=True)
+        self.assertContains(response, '4 of 4 rows are valid')
+
+    def test_pool_size_is_capped_by_the_setting(self):
+        with mock.patch.object(staff_import, 'ProcessPoolExecutor') as pool:
+            pool.return_value.__enter__.return_value.map.return_value = ['x', 'y']
+            staff_import.hash_passwords(['a', 'b'], workers=16)
+        self.assertEqual(pool.call_args.kwargs['max_workers'], 2)
@@ -2,14 +2,14 @@ from django.urls import path
 from .views import (
     DashboardDispatcher, AdminDashboardView, HODDashboardView,
     PSMDashboardView, DeanDashboardView, LecturerDashboardView,
-    StaffListView, StaffCreateView, StaffUpdateView, StaffPasswordResetView, StaffUnlockView, 
+    StaffListView, StaffCreateView, StaffImportView, StaffUpdateView, StaffPasswordResetView, StaffUnlockView, 
     StaffDeactivateView, StaffActivateView, TaskForceListView, TaskForceCreateView,
     TaskForceUpdateView, DepartmentListView, DepartmentCreateView, DepartmentUpdateView, HODTaskForceListView,
     HODTaskForceUpdateView, PSMTaskForceListView, PSMTaskForceDetailView,
     PSMTaskForceModifyView, PSMActionedTaskForceListView, PSMActionedTaskForceUpdateView,
-    LecturerTaskForceListView, DeanReportView, AuditLogListView, WorkloadSettingsView
+    LecturerTaskForceListView, DeanReportView, AuditLogListView, WorkloadSettingsView, ProfilerView
 )
-from .api import staff_list_api
+from .api import staff_list_api, roster_simulation_api, roster_suggestion_api
 
 app_name = 'dashboard'
 
@@ -21,6 +21,7 @@ urlpatterns = [
     path('admin/', AdminDashboardView.as_view(), name='admin'),
     path('admin/staff/', StaffListView.as_view(), name='staff_list'),
     path('admin/staff/add/', StaffCreateView.as_view(), name='staff_add'),
+    path('admin/staff/import/', StaffImportView.as_view(), name='staff_import'),
     path("admin/staff/<int:pk>/edit/", StaffUpdateView.as_view(), name="staff_edit"),
     path('admin/staff/<int:pk>/unlock/', StaffUnlockView.as_view(), name='staff_unlock'),
     path('admin/staff/<int:pk>/deactivate/', StaffDeactivateView.as_view(), name='staff_deactivate'),
@@ -33,9 +34,12 @@ urlpatterns = [
     path('admin/department/add/', DepartmentCreateView.as_view(), name='department_add'),
     path('admin/department/<int:pk>/edit/', DepartmentUpdateView.as_view(), name='department_edit'),
     path('admin/settings/workload/', WorkloadSettingsView.as_view(), name='workload_settings'),
+    path('admin/profiler/', ProfilerView.as_view(), name='profiler'),
 
     # API
     path('api/staff/', staff_list_api, name='staff_list_api'),
+    path('api/taskforce/<int:pk>/simulate/', roster_simulation_api, name='roster_simulation_api'),
+    path('api/taskforce/<int:pk>/suggest/', roster_suggestion_api, name='roster_suggestion_api'),
     
     # HOD Views
     path('hod/', HODDashboardView.as_view(), name='hod'),
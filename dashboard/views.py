@@ -1,4 +1,4 @@
-from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView, View
+from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView, View, FormView
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -6,15 +6,23 @@ from django.contrib.auth.forms import PasswordResetForm
 from django.urls import reverse_lazy
 from django.utils.crypto import get_random_string
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
-from .mixins import RoleRequiredMixin
+from .mixins import RoleRequiredMixin, ReplicaReadMixin
 from accounts.models import User, AuditLog
-from django.db.models import Q
-from university.models import TaskForce, Department, WorkloadSettings
-from .forms import StaffForm, TaskForceForm, DepartmentForm, WorkloadSettingsForm
+from django.db.models import Q, F, Count, Sum, Exists, OuterRef, Subquery, Window, prefetch_related_objects
+from django.db.models.functions import Coalesce
+from django.core.paginator import Paginator, Page
+from university.models import TaskForce, Department, WorkloadSettings, StaffWorkload
+from university.cache import get_departments, stats as refdata_cache_stats
+from .forms import StaffForm, TaskForceForm, DepartmentForm, WorkloadSettingsForm, StaffImportUploadForm
+from .staff_import import StaffImportError, import_staff, read_rows as read_staff_rows
+from . import counters, profiling
+from django.conf import settings
+from django.db import router
+
+# Cards per page on the task force lists (grids are 2 or 3 wide)
+TASKFORCE_PAGE_SIZE = 12
 
 class DashboardDispatcher(LoginRequiredMixin, TemplateView):
     """Redirects authenticated users to their specific role dashboard."""
@@ -38,9 +46,7 @@ class AdminDashboardView(RoleRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['staff_count'] = User.objects.exclude(role=User.Role.ADMIN).count()
-        context['taskforce_count'] = TaskForce.objects.count()
-        context['department_count'] = Department.objects.count()
+        context.update(counters.admin_counters())
         context['recent_users'] = User.objects.order_by('-date_joined')[:5]
         context['recent_logs'] = AuditLog.objects.select_related('actor').order_by('-timestamp')[:5]
         return context
@@ -52,6 +58,48 @@ class DepartmentListView(RoleRequiredMixin, ListView):
     context_object_name = "departments"
     required_role = User.Role.ADMIN
 
+    # ?sort= value -> annotation ("-" prefix on the value flips it)
+    SORT_FIELDS = {
+        'name': 'name',
+        'staff': 'staff_count',
+        'lecturers': 'active_lecturers',
+        'taskforces': 'taskforce_count',
+        'active': 'active_taskforces',
+        'submitted': 'submitted_taskforces',
+        'approved': 'approved_taskforces',
+        'workload': 'staff_workload',
+    }
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort') or 'name'
+        if sort.lstrip('-') not in self.SORT_FIELDS:
+            sort = 'name'
+        return sort
+
+    def get_queryset(self):
+        # Every figure is a correlated subquery, so the page is one query however many departments there are
+        Memberships = TaskForce.departments.through
+        workload = StaffWorkload.objects.filter(user__department=OuterRef('pk')).order_by().values('user__department').annotate(total=Sum('total_weightage')).values('total')
+        queryset = Department.objects.annotate(
+            staff_count=counters.count_of(User.objects.all(), 'department'),
+            active_lecturers=counters.count_of(User.objects.filter(role=User.Role.LECTURER, is_active=True), 'department'),
+            taskforce_count=counters.count_of(Memberships.objects.all(), 'department'),
+            active_taskforces=counters.count_of(Memberships.objects.filter(taskforce__status='ACTIVE'), 'department'),
+            submitted_taskforces=counters.count_of(Memberships.objects.filter(taskforce__status='SUBMITTED'), 'department'),
+            approved_taskforces=counters.count_of(Memberships.objects.filter(taskforce__status='APPROVED'), 'department'),
+            staff_workload=Coalesce(Subquery(workload), 0),
+        )
+        sort = self.get_sort()
+        field = self.SORT_FIELDS[sort.lstrip('-')]
+        if sort.startswith('-'):
+            return queryset.order_by(F(field).desc(), 'name')
+        return queryset.order_by(F(field).asc(), 'name')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['sort'] = self.get_sort()
+        return context
+
 class DepartmentCreateView(RoleRequiredMixin, CreateView):
     model = Department
     form_class = DepartmentForm
@@ -98,7 +146,6 @@ class StaffCreateView(RoleRequiredMixin, CreateView):
         user.must_change_password = True
         user.save()
         
-        # Send Email
         # Send Email
         subject = "Welcome to Task Force Management System"
         context = {
@@ -109,17 +156,53 @@ class StaffCreateView(RoleRequiredMixin, CreateView):
         html_message = render_to_string('email/account_created.html', context)
         plain_message = strip_tags(html_message)
         
-        try:
-            send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [user.email], html_message=html_message)
-            messages.success(self.request, f"Staff created. Email sent to {user.email}.")
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            messages.warning(self.request, f"Staff created, but email failed to send. Temp Password: {temp_password}")
+        queue_email(subject, plain_message, [user.email], html_message=html_message, sensitive=True)
+        messages.success(
+            self.request,
+            f"Staff created. Welcome email queued for {user.email}. "
+            "If it doesn't arrive, use Reset Password on the staff page to send a new link."
+        )
 
         log_action(self.request, self.request.user, "CREATE_USER", "User", user.pk, f"Created user {user.username}")
         
         return response
 
+class StaffImportView(RoleRequiredMixin, FormView):
+    """Bulk onboarding from a CSV/XLSX upload (same engine as `manage.py import_staff`)."""
+    form_class = StaffImportUploadForm
+    template_name = "dashboard/admin/staff_import.html"
+    required_role = User.Role.ADMIN
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        dry_run = form.cleaned_data['dry_run']
+        try:
+            rows = read_staff_rows(upload, upload.name)
+        except StaffImportError as e:
+            form.add_error('file', str(e))
+            return self.form_invalid(form)
+
+        # Passwords are hashed inside this request, so big files go through the command instead
+        limit = settings.STAFF_IMPORT_WEB_MAX_ROWS
+        if not dry_run and len(rows) > limit:
+            form.add_error('file', f"Uploads can create at most {limit} accounts. Split the file or run `manage.py import_staff`.")
+            return self.form_invalid(form)
+
+        created, errors = import_staff(
+            rows,
+            actor=self.request.user,
+            login_url=self.request.build_absolute_uri(reverse_lazy('login')),
+            dry_run=dry_run,
+            request=self.request,
+        )
+        if dry_run:
+            messages.info(self.request, f"Dry run: {len(rows) - len(errors)} of {len(rows)} rows are valid.")
+        else:
+            messages.success(self.request, f"Created {len(created)} staff accounts. Welcome emails are queued.")
+        return self.render_to_response(self.get_context_data(
+            form=form, import_errors=errors, total_rows=len(rows), dry_run=dry_run,
+        ))
+
 class StaffUpdateView(RoleRequiredMixin, UpdateView):
     model = User
     form_class = StaffForm
@@ -182,12 +265,9 @@ class StaffUnlockView(RoleRequiredMixin, View):
             html_message = render_to_string('email/notification.html', context)
             plain_message = strip_tags(html_message)
 
-            try:
-                send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [user.email], html_message=html_message)
-            except Exception as e:
-                print(f"Error sending email: {e}")
+            queue_email(subject, plain_message, [user.email], html_message=html_message)
 
-            messages.success(request, f"Account unlocked for {user.username}. Email sent.")
+            messages.success(request, f"Account unlocked for {user.username}. Notification email queued.")
             log_action(request, request.user, "UNLOCK_USER", "User", user.pk, f"Unlocked user {user.username}")
             
         except User.DoesNotExist:
@@ -220,12 +300,9 @@ class StaffDeactivateView(RoleRequiredMixin, View):
             html_message = render_to_string('email/notification.html', context)
             plain_message = strip_tags(html_message)
             
-            try:
-                send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [user.email], html_message=html_message)
-            except Exception as e:
-                print(f"Error sending email: {e}")
+            queue_email(subject, plain_message, [user.email], html_message=html_message)
 
-            messages.success(request, f"User {user.username} deactivated successfully. Notification email sent.")
+            messages.success(request, f"User {user.username} deactivated successfully. Notification email queued.")
             log_action(request, request.user, "DEACTIVATE_USER", "User", user.pk, f"Deactivated user {user.username}. Reason: {justification}")
             
         except User.DoesNotExist:
@@ -257,12 +334,9 @@ class StaffActivateView(RoleRequiredMixin, View):
             html_message = render_to_string('email/notification.html', context)
             plain_message = strip_tags(html_message)
             
-            try:
-                send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [user.email], html_message=html_message)
-            except Exception as e:
-                print(f"Error sending email: {e}")
+            queue_email(subject, plain_message, [user.email], html_message=html_message)
 
-            messages.success(request, f"User {user.username} activated successfully. Notification email sent.")
+            messages.success(request, f"User {user.username} activated successfully. Notification email queued.")
             log_action(request, request.user, "ACTIVATE_USER", "User", user.pk, f"Activated user {user.username}")
             
         except User.DoesNotExist:
@@ -276,6 +350,10 @@ class TaskForceListView(RoleRequiredMixin, ListView):
     template_name = "dashboard/admin/taskforce_list.html"
     context_object_name = "taskforces"
     required_role = User.Role.ADMIN
+    paginate_by = TASKFORCE_PAGE_SIZE
+
+    def get_queryset(self):
+        return TaskForce.objects.with_summary().order_by('-created_at', '-pk')
 
 class TaskForceCreateView(RoleRequiredMixin, CreateView):
     model = TaskForce
@@ -325,11 +403,47 @@ class WorkloadSettingsView(RoleRequiredMixin, UpdateView):
         obj, created = WorkloadSettings.objects.get_or_create(pk=1)
         return obj
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['refdata_cache_stats'] = refdata_cache_stats()
+        return context
+
     def form_valid(self, form):
         messages.success(self.request, "Workload thresholds updated successfully.")
         log_action(self.request, self.request.user, "UPDATE_SETTINGS", "WorkloadSettings", self.object.pk, f"Updated thresholds: Min={form.instance.min_weightage}, Max={form.instance.max_weightage}")
         return super().form_valid(form)
 
+class ProfilerView(RoleRequiredMixin, TemplateView):
+    """Slowest and most query-heavy endpoints, from dashboard.profiling."""
+    template_name = "dashboard/admin/profiler.html"
+    required_role = User.Role.ADMIN
+    SORTS = {
+        'avg_ms': 'Avg time', 'max_ms': 'Max time', 'avg_queries': 'Avg queries',
+        'max_queries': 'Max queries', 'duplicate_queries': 'Repeated queries', 'requests': 'Requests',
+    }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        rows = profiling.records()
+        sort = self.request.GET.get('sort')
+        if sort not in self.SORTS:
+            sort = 'avg_ms'
+        context['enabled'] = settings.PROFILER_ENABLED
+        context['persisted'] = settings.PROFILER_PERSIST
+        context['threshold'] = settings.PROFILER_QUERY_WARNING_THRESHOLD
+        context['sort'] = sort
+        context['sorts'] = self.SORTS
+        context['record_count'] = len(rows)
+        context['endpoints'] = sorted(profiling.summarize(rows), key=lambda e: e[sort], reverse=True)
+        context['slowest'] = sorted(rows, key=lambda r: r['duration_ms'], reverse=True)[:15]
+        context['heaviest'] = sorted(rows, key=lambda r: r['query_count'], reverse=True)[:15]
+        return context
+
+    def post(self, request, *args, **kwargs):
+        profiling.clear()
+        messages.success(request, "Profiler records cleared.")
+        return redirect('dashboard:profiler')
+
 class HODDashboardView(RoleRequiredMixin, TemplateView):
     template_name = "dashboard/hod_dashboard.html"
     required_role = User.Role.HOD
@@ -337,12 +451,17 @@ class HODDashboardView(RoleRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.department:
-            taskforces = TaskForce.objects.filter(departments=self.request.user.department).distinct()
-            context['taskforce_count'] = taskforces.count()
-            context['taskforces'] = taskforces
+            taskforces = TaskForce.objects.with_summary().filter(departments=self.request.user.department).order_by('-updated_at', '-pk')
         else:
-            context['taskforce_count'] = 0
-            context['taskforces'] = TaskForce.objects.none()
+            taskforces = TaskForce.objects.none()
+        # One COUNT for the total, one query for the page (plus the departments prefetch)
+        paginator = Paginator(taskforces, TASKFORCE_PAGE_SIZE)
+        page = paginator.get_page(self.request.GET.get('page'))
+        context['taskforce_count'] = paginator.count
+        context['taskforces'] = page.object_list
+        context['page_obj'] = page
+        context['paginator'] = paginator
+        context['is_paginated'] = page.has_other_pages()
         return context
 
 from django.views.generic import ListView, CreateView, UpdateView
@@ -358,12 +477,13 @@ class HODTaskForceListView(RoleRequiredMixin, ListView):
     template_name = "dashboard/hod/taskforce_list.html"
     context_object_name = "taskforces"
     required_role = User.Role.HOD
+    paginate_by = TASKFORCE_PAGE_SIZE
 
     def get_queryset(self):
         # Filter task forces that include the HOD's department
         if not self.request.user.department:
             return TaskForce.objects.none()
-        return TaskForce.objects.filter(departments=self.request.user.department).distinct()
+        return TaskForce.objects.with_summary().filter(departments=self.request.user.department).order_by('-updated_at', '-pk')
 
 class HODTaskForceUpdateView(RoleRequiredMixin, UpdateView):
     model = TaskForce
@@ -399,16 +519,17 @@ class HODTaskForceUpdateView(RoleRequiredMixin, UpdateView):
         import json
         
         # Serialize Members
+        members = list(self.object.members.all())
+        # Calculate workload (including this task force as they are already a member)
+        statuses = WorkloadService.bulk_workload_status(members)
         members_data = []
-        for member in self.object.members.all():
-            # Calculate workload (including this task force as they are already a member)
-            status = WorkloadService.get_workload_status(member)
+        for member in members:
             members_data.append({
                 'id': member.id,
                 'name': member.get_full_name() or member.username,
                 'email': member.email,
                 'role': member.get_role_display(),
-                'workload': status
+                'workload': statuses[member.id]
             })
         
         context['current_members_json'] = json.dumps(members_data)
@@ -451,10 +572,7 @@ class HODTaskForceUpdateView(RoleRequiredMixin, UpdateView):
             html_message = render_to_string('email/notification.html', context)
             plain_message = strip_tags(html_message)
             
-            try:
-                send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [self.request.user.email], html_message=html_message)
-            except Exception as e:
-                print(f"Error sending email: {e}")
+            queue_email(subject, plain_message, [self.request.user.email], html_message=html_message)
 
             # Notify assigned PSM on resubmission
             if self.object.assigned_psm and self.object.assigned_psm.email:
@@ -467,12 +585,9 @@ class HODTaskForceUpdateView(RoleRequiredMixin, UpdateView):
                 }
                 psm_html = render_to_string('email/notification.html', psm_context)
                 psm_plain = strip_tags(psm_html)
-                try:
-                    send_mail(psm_subject, psm_plain, settings.DEFAULT_FROM_EMAIL, [self.object.assigned_psm.email], html_message=psm_html)
-                except Exception as e:
-                    print(f"Error sending email to PSM: {e}")
+                queue_email(psm_subject, psm_plain, [self.object.assigned_psm.email], html_message=psm_html)
                 
-            messages.success(self.request, f"Task Force '{self.object.name}' submitted successfully. Confirmation email sent.")
+            messages.success(self.request, f"Task Force '{self.object.name}' submitted successfully. Confirmation email queued.")
             return response
             
         elif action == 'save_draft':
@@ -498,35 +613,170 @@ class HODTaskForceUpdateView(RoleRequiredMixin, UpdateView):
 
         return super().form_valid(form)
 
-from accounts.utils import log_action
-import csv
-from django.http import HttpResponse
-
-class AuditLogListView(RoleRequiredMixin, ListView):
+from accounts.utils import log_action, queue_email
+import base64
+from datetime import datetime, time, timedelta
+from django.db import connection
+from django.db.models import Max, Min
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from .exports import audit_log_rows, stream_csv
+from accounts import archive as audit_archive
+
+class AuditLogListView(RoleRequiredMixin, ReplicaReadMixin, ListView):
+    """
+    Audit log viewer with keyset pagination on (timestamp, id): every page is an
+    index range scan, however deep, and no COUNT(*) over the whole table is run.
+    """
     model = AuditLog
     template_name = "dashboard/admin/audit_log.html"
     context_object_name = "logs"
     required_role = User.Role.ADMIN
-    paginate_by = 20
+    page_size = 20
+    count_cap = 10000
+    export_chunk_size = 2000
+
+    def get_filters(self):
+        """Filters shared by the list, the export and the archive reader. All are exact matches."""
+        params = self.request.GET
+        filters = {
+            'user': params.get('user') or None,
+            'action': params.get('action') or None,
+            'target_model': params.get('target_model') or None,
+            'target_id': params.get('target_id') or None,
+            'start': None,
+            'end': None,
+        }
+        # Date range (inclusive). Compare against day boundaries so the timestamp index stays usable.
+        date_from = parse_date(params.get('date_from') or '')
+        if date_from:
+            filters['start'] = timezone.make_aware(datetime.combine(date_from, time.min))
+        date_to = parse_date(params.get('date_to') or '')
+        if date_to:
+            filters['end'] = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        return filters
 
     def get_queryset(self):
+        filters = self.get_filters()
         queryset = AuditLog.objects.all().select_related('actor')
-        user_query = self.request.GET.get('user')
-        if user_query:
-            queryset = queryset.filter(actor__username__icontains=user_query)
+        if filters['user']:
+            queryset = queryset.filter(actor__username=filters['user'])
+        if filters['action']:
+            queryset = queryset.filter(action=filters['action'])
+        if filters['target_model']:
+            queryset = queryset.filter(target_model=filters['target_model'])
+        if filters['target_id']:
+            queryset = queryset.filter(target_id=filters['target_id'])
+        if filters['start']:
+            queryset = queryset.filter(timestamp__gte=filters['start'])
+        if filters['end']:
+            queryset = queryset.filter(timestamp__lt=filters['end'])
         return queryset
 
-    def render_to_response(self, context, **response_kwargs):
-        # Handle Export
-        if self.request.GET.get('export') == 'csv':
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="audit_logs.csv"'
-            writer = csv.writer(response)
-            writer.writerow(['Timestamp', 'Actor', 'Action', 'Target Model', 'Target ID', 'Details', 'IP'])
-            for log in self.get_queryset():
-                writer.writerow([log.timestamp, log.actor, log.action, log.target_model, log.target_id, log.details, log.ip_address])
-            return response
-        return super().render_to_response(context, **response_kwargs)
+    @staticmethod
+    def encode_cursor(log):
+        raw = f"{log.timestamp.isoformat()}|{log.pk}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Returns (timestamp, id), or None for a missing or malformed cursor."""
+        if not cursor:
+            return None
+        try:
+            timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+            return datetime.fromisoformat(timestamp), int(pk)
+        except ValueError:
+            return None
+
+    def get_page(self, queryset):
+        """Returns (logs, older_cursor, newer_cursor) for the requested keyset page, newest first."""
+        after = self.decode_cursor(self.request.GET.get('after'))
+        before = self.decode_cursor(self.request.GET.get('before'))
+
+        if before:
+            # Walk forwards from the cursor, then flip back to newest-first
+            ts, pk = before
+            logs = list(queryset.filter(Q(timestamp__gt=ts) | Q(timestamp=ts, id__gt=pk)).order_by('timestamp', 'id')[:self.page_size + 1])
+            has_newer = len(logs) > self.page_size
+            logs = logs[:self.page_size][::-1]
+            has_older = True
+        else:
+            queryset = queryset.order_by('-timestamp', '-id')
+            if after:
+                ts, pk = after
+                queryset = queryset.filter(Q(timestamp__lt=ts) | Q(timestamp=ts, id__lt=pk))
+            logs = list(queryset[:self.page_size + 1])
+            has_older = len(logs) > self.page_size
+            logs = logs[:self.page_size]
+            has_newer = after is not None
+
+        older = self.encode_cursor(logs[-1]) if logs and has_older else None
+        newer = self.encode_cursor(logs[0]) if logs and has_newer else None
+        return logs, older, newer
+
+    def estimate_count(self, queryset, filtered):
+        """
+        Returns (count, is_lower_bound).
+        Unfiltered: the planner's row estimate on PostgreSQL, otherwise the id span.
+        Filtered: an exact count capped at count_cap rows.
+        """
+        if filtered:
+            count = queryset.order_by()[:self.count_cap + 1].count()
+            return min(count, self.count_cap), count > self.count_cap
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [AuditLog._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0], False
+        span = AuditLog.objects.aggregate(low=Min('id'), high=Max('id'))
+        if span['low'] is None:
+            return 0, False
+        return span['high'] - span['low'] + 1, False
+
+    def get_context_data(self, **kwargs):
+        queryset = kwargs.pop('object_list', self.object_list)
+        logs, older, newer = self.get_page(queryset)
+        context = super().get_context_data(object_list=logs, **kwargs)
+
+        filtered = any(self.get_filters().values())
+        context['estimated_count'], context['count_is_lower_bound'] = self.estimate_count(queryset, filtered)
+
+        # Keep the filters on the pagination links
+        params = self.request.GET.copy()
+        for key in ('after', 'before', 'export', 'compress'):
+            params.pop(key, None)
+        context['filter_query'] = params.urlencode()
+        context['older_cursor'] = older
+        context['newer_cursor'] = newer
+        return context
+
+    def get(self, request, *args, **kwargs):
+        # Handle Export before ListView paginates (and counts) the table
+        if request.GET.get('export') == 'csv':
+            return self.export_csv()
+        return super().get(request, *args, **kwargs)
+
+    def export_csv(self):
+        """
+        Streams the filtered log as CSV (optionally gzip: ?compress=gzip) in constant memory.
+        Rows come out oldest first: archived partitions (see archive_audit_logs), then the live table.
+        """
+        compress = self.request.GET.get('compress') == 'gzip'
+        # The rows are read after dispatch returns, so bind the queryset to this request's database now
+        rows = audit_log_rows(
+            self.get_queryset().order_by('timestamp', 'id').using(router.db_for_read(AuditLog)),
+            archived_rows=audit_archive.iter_rows(**self.get_filters()),
+            chunk_size=self.export_chunk_size,
+        )
+        response = StreamingHttpResponse(
+            stream_csv(rows, compress=compress),
+            content_type='application/gzip' if compress else 'text/csv',
+        )
+        filename = 'audit_logs.csv.gz' if compress else 'audit_logs.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
 class PSMDashboardView(RoleRequiredMixin, TemplateView):
     template_name = "dashboard/psm_dashboard.html"
@@ -534,9 +784,8 @@ class PSMDashboardView(RoleRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Count Pending Approvals
-        context['pending_count'] = TaskForce.objects.filter(status='SUBMITTED').count()
-        context['actioned_count'] = TaskForce.objects.filter(assigned_psm=self.request.user).count()
+        # Pending approvals and what this PSM has actioned
+        context.update(counters.psm_counters(self.request.user))
         return context
 
 class PSMTaskForceListView(RoleRequiredMixin, ListView):
@@ -544,14 +793,15 @@ class PSMTaskForceListView(RoleRequiredMixin, ListView):
     template_name = "dashboard/psm/taskforce_list.html"
     context_object_name = "taskforces"
     required_role = User.Role.PSM
+    paginate_by = TASKFORCE_PAGE_SIZE
 
     def get_queryset(self):
         # PSM sees SUBMITTED task forces for approval
-        return TaskForce.objects.filter(
+        return TaskForce.objects.with_summary().filter(
             status='SUBMITTED'
         ).filter(
             Q(assigned_psm__isnull=True) | Q(assigned_psm=self.request.user)
-        ).order_by('-updated_at')
+        ).order_by('-updated_at', '-pk')
 
 from django.views.generic import DetailView
 
@@ -601,10 +851,7 @@ class PSMTaskForceDetailView(RoleRequiredMixin, DetailView):
                 }
                 html_message = render_to_string('email/notification.html', context)
                 plain_message = strip_tags(html_message)
-                try:
-                    send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, list(set(recipients)), html_message=html_message)
-                except Exception as e:
-                    print(f"Error sending email: {e}")
+                queue_email(subject, plain_message, list(set(recipients)), html_message=html_message)
 
             messages.success(request, f"Task Force '{self.object.name}' approved.")
             return redirect('dashboard:psm_taskforce_list')
@@ -631,10 +878,7 @@ class PSMTaskForceDetailView(RoleRequiredMixin, DetailView):
                     }
                     html_message = render_to_string('email/notification.html', context)
                     plain_message = strip_tags(html_message)
-                    try:
-                        send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [self.object.submitted_by.email], html_message=html_message)
-                    except Exception as e:
-                        print(f"Error sending email: {e}")
+                    queue_email(subject, plain_message, [self.object.submitted_by.email], html_message=html_message)
 
                 messages.success(request, f"Task Force '{self.object.name}' rejected.")
                 return redirect('dashboard:psm_taskforce_list')
@@ -669,15 +913,16 @@ class PSMTaskForceModifyView(RoleRequiredMixin, UpdateView):
         from university.services import WorkloadService
         import json
 
+        members = list(self.object.members.all())
+        statuses = WorkloadService.bulk_workload_status(members)
         members_data = []
-        for member in self.object.members.all():
-            status = WorkloadService.get_workload_status(member)
+        for member in members:
             members_data.append({
                 'id': member.id,
                 'name': member.get_full_name() or member.username,
                 'email': member.email,
                 'role': member.get_role_display(),
-                'workload': status
+                'workload': statuses[member.id]
             })
         context['current_members_json'] = json.dumps(members_data)
         context['department_ids'] = ",".join(str(d.id) for d in self.object.departments.all())
@@ -715,10 +960,7 @@ class PSMTaskForceModifyView(RoleRequiredMixin, UpdateView):
             }
             html_message = render_to_string('email/notification.html', context)
             plain_message = strip_tags(html_message)
-            try:
-                send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, list(set(recipients)), html_message=html_message)
-            except Exception as e:
-                print(f"Error sending email: {e}")
+            queue_email(subject, plain_message, list(set(recipients)), html_message=html_message)
 
         messages.success(self.request, f"Task Force '{self.object.name}' modified and approved.")
         return redirect(self.success_url)
@@ -728,9 +970,10 @@ class PSMActionedTaskForceListView(RoleRequiredMixin, ListView):
     template_name = "dashboard/psm/taskforce_actioned_list.html"
     context_object_name = "taskforces"
     required_role = User.Role.PSM
+    paginate_by = TASKFORCE_PAGE_SIZE
 
     def get_queryset(self):
-        return TaskForce.objects.filter(assigned_psm=self.request.user).order_by('-updated_at')
+        return TaskForce.objects.with_summary().filter(assigned_psm=self.request.user).order_by('-updated_at', '-pk')
 
 class PSMActionedTaskForceUpdateView(RoleRequiredMixin, UpdateView):
     model = TaskForce
@@ -753,15 +996,16 @@ class PSMActionedTaskForceUpdateView(RoleRequiredMixin, UpdateView):
         from university.services import WorkloadService
         import json
 
+        members = list(self.object.members.all())
+        statuses = WorkloadService.bulk_workload_status(members)
         members_data = []
-        for member in self.object.members.all():
-            status = WorkloadService.get_workload_status(member)
+        for member in members:
             members_data.append({
                 'id': member.id,
                 'name': member.get_full_name() or member.username,
                 'email': member.email,
                 'role': member.get_role_display(),
-                'workload': status
+                'workload': statuses[member.id]
             })
         context['current_members_json'] = json.dumps(members_data)
         context['department_ids'] = ",".join(str(d.id) for d in self.object.departments.all())
@@ -800,10 +1044,7 @@ class PSMActionedTaskForceUpdateView(RoleRequiredMixin, UpdateView):
             }
             html_message = render_to_string('email/notification.html', context)
             plain_message = strip_tags(html_message)
-            try:
-                send_mail(subject, plain_message, settings.DEFAULT_FROM_EMAIL, list(set(recipients)), html_message=html_message)
-            except Exception as e:
-                print(f"Error sending email: {e}")
+            queue_email(subject, plain_message, list(set(recipients)), html_message=html_message)
 
         messages.success(self.request, "Locked task force updated successfully.")
         return redirect(self.success_url)
@@ -815,9 +1056,7 @@ class DeanDashboardView(RoleRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Executive Stats
-        context['total_taskforces'] = TaskForce.objects.count()
-        context['active_taskforces'] = TaskForce.objects.filter(status='APPROVED').count()
-        context['pending_approvals'] = TaskForce.objects.filter(status='SUBMITTED').count()
+        context.update(counters.dean_counters())
         return context
 
 class LecturerDashboardView(RoleRequiredMixin, TemplateView):
@@ -835,35 +1074,113 @@ class LecturerTaskForceListView(RoleRequiredMixin, ListView):
     template_name = "dashboard/lecturer/portfolio.html"
     context_object_name = "taskforces"
     required_role = User.Role.LECTURER
+    paginate_by = TASKFORCE_PAGE_SIZE
 
     def get_queryset(self):
         # Lecturer sees Task Forces they are a member of OR chairman of
         # Filter by APPROVED only? SRS doesn't specify, but usually they work on Approved ones.
         # Let's show all for visibility, maybe filter stats in template.
         from django.db.models import Q
-        return TaskForce.objects.filter(
+        return TaskForce.objects.with_summary().filter(
             Q(members=self.request.user)
-        ).distinct().order_by('-updated_at')
+        ).order_by('-updated_at', '-pk')
 
-class DeanReportView(RoleRequiredMixin, ListView):
+class DeanReportView(RoleRequiredMixin, ReplicaReadMixin, ListView):
     model = TaskForce
     template_name = "dashboard/dean/report_list.html"
     context_object_name = "taskforces"
     required_role = User.Role.DEAN
+    paginate_by = 25
+
+    # ?sort= value -> queryset ordering ("-" prefix on the value flips it)
+    SORT_FIELDS = {
+        'created': 'created_at',
+        'name': 'name',
+        'status': 'status',
+        'weightage': 'weightage',
+        'members': 'member_count',
+        'assigned': 'assigned_weightage',
+    }
+    DEFAULT_SORT = '-created'
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort') or self.DEFAULT_SORT
+        if sort.lstrip('-') not in self.SORT_FIELDS:
+            sort = self.DEFAULT_SORT
+        return sort
 
     def get_queryset(self):
         # Dean sees ALL task forces
-        queryset = TaskForce.objects.all().prefetch_related('departments')
-        
-        # Filter by Department
+        Members = TaskForce.members.through
+        member_count = Members.objects.filter(taskforce_id=OuterRef('pk')).order_by().values('taskforce_id').annotate(n=Count('pk')).values('n')
+        queryset = TaskForce.objects.annotate(
+            member_count=Coalesce(Subquery(member_count), 0),
+            assigned_weightage=F('weightage') * F('member_count'),
+        )
+
+        # Filter by Department. EXISTS instead of a join so a task force shared
+        # by several departments still appears once
         dept_id = self.request.GET.get('department')
-        if dept_id:
-            queryset = queryset.filter(departments__id=dept_id)
-            
-        return queryset.order_by('-created_at')
+        if dept_id and dept_id.isdigit():
+            queryset = queryset.filter(Exists(
+                TaskForce.departments.through.objects.filter(taskforce_id=OuterRef('pk'), department_id=dept_id)
+            ))
+
+        sort = self.get_sort()
+        field = self.SORT_FIELDS[sort.lstrip('-')]
+        if sort.startswith('-'):
+            return queryset.order_by(F(field).desc(), '-pk')
+        return queryset.order_by(F(field).asc(), 'pk')
+
+    def summary_annotations(self):
+        """Window counts over the whole filtered set, so they ride along with the page query."""
+        annotations = {'filtered_total': Window(Count('pk'))}
+        for status, _ in TaskForce.STATUS_CHOICES:
+            annotations[f'status_{status}'] = Window(Count('pk', filter=Q(status=status)))
+        return annotations
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Fetches one page together with the total and per-status counts in a single
+        query, instead of Paginator's separate COUNT(*).
+        """
+        try:
+            number = max(int(self.request.GET.get('page') or 1), 1)
+        except ValueError:
+            number = 1
+
+        annotations = self.summary_annotations()
+        offset = (number - 1) * page_size
+        rows = list(queryset.annotate(**annotations)[offset:offset + page_size])
+        if rows:
+            totals = {name: getattr(rows[0], name) for name in annotations}
+        else:
+            # Empty result or a page past the end: count separately
+            totals = queryset.aggregate(
+                filtered_total=Count('pk'),
+                **{f'status_{status}': Count('pk', filter=Q(status=status)) for status, _ in TaskForce.STATUS_CHOICES}
+            )
+
+        paginator = Paginator(TaskForce.objects.none(), page_size)
+        paginator.count = totals['filtered_total']  # Known already, skip the COUNT(*) query
+        if not rows and number > paginator.num_pages:
+            number = paginator.num_pages
+            offset = (number - 1) * page_size
+            rows = list(queryset[offset:offset + page_size])
+
+        prefetch_related_objects(rows, 'departments')
+        self.status_summary = [
+            {'status': status, 'label': label, 'count': totals[f'status_{status}']}
+            for status, label in TaskForce.STATUS_CHOICES
+        ]
+        page = Page(rows, number, paginator)
+        return paginator, page, rows, page.has_other_pages()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        from university.models import Department
-        context['departments'] = Department.objects.all()
+        context['departments'] = get_departments()
+        context['status_summary'] = self.status_summary
+        context['total_count'] = context['paginator'].count
+        context['sort'] = self.get_sort()
+        context['department_query'] = self.request.GET.get('department', '')
         return context
@@ -0,0 +1,96 @@
+"""
+Read-replica routing.
+
+All writes go to the primary ('default'). Reads go to the replica alias
+(DATABASE_REPLICA_ALIAS, configured from REPLICA_DATABASE_URL) only inside
+replica_reads() -- used by the reporting views, staff_list_api and the dashboard
+counters between writes -- and otherwise to the primary, so pages that read and then write keep
+seeing consistent data.
+
+Read-your-writes: once a request writes (anything but sessions, audit entries and
+profiler records), ReplicaPinningMiddleware sets a cookie that keeps that
+browser's reads on the primary for DATABASE_PIN_SECONDS, long enough for the
+replica to catch up. Reads inside a transaction also stay on the primary.
+
+Without REPLICA_DATABASE_URL the router has no opinion and everything uses 'default'.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Writes to these models don't pin the user to the primary (they happen on most requests)
+UNPINNED_MODELS = {'sessions.session', 'accounts.auditlog', 'dashboard.requestprofile'}
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+_request_state = contextvars.ContextVar('replica_request_state', default=None)
+
+
+def replica_alias():
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def replica_reads():
+    """Reads inside this block may use the replica. Works as a decorator too."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Reads inside this block use the primary, even within replica_reads()."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if not alias or not _use_replica.get():
+            return None
+        state = _request_state.get()
+        if state and (state['pinned'] or state['wrote']):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None and model._meta.label_lower not in UNPINNED_MODELS:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary
+        return True
+
+
+class ReplicaPinningMiddleware:
+    """Tracks writes per request and pins the browser to the primary after one."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = getattr(settings, 'DATABASE_PIN_COOKIE', 'tfms_primary')
+        state = {'pinned': cookie in request.COOKIES, 'wrote': False}
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state['wrote'] and replica_alias():
+            response.set_cookie(
+                cookie, '1', max_age=getattr(settings, 'DATABASE_PIN_SECONDS', 10),
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
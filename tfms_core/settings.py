@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -27,6 +28,9 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['junaed.pythonanywhere.com', 'localhost', '127.0.0.1']
 
+# Public address used in links from emails sent outside a request (e.g. manage.py import_staff)
+SITE_URL = os.environ.get('SITE_URL', 'https://junaed.pythonanywhere.com')
+
 
 # Application definition
 
@@ -44,8 +48,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'dashboard.profiling.RequestProfilerMiddleware',  # No-op unless PROFILER_ENABLED
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'tfms_core.replica.ReplicaPinningMiddleware',  # Read-your-writes when a replica is configured
+    'accounts.middleware.AuditLogBufferMiddleware',
+    'accounts.middleware.LowWriteSessionMiddleware',  # SessionMiddleware without a write per request
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -78,7 +85,6 @@ WSGI_APPLICATION = 'tfms_core.wsgi.application'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
 import dj_database_url
-import os
 
 DATABASES = {
     'default': dj_database_url.config(
@@ -88,6 +94,66 @@ DATABASES = {
     )
 }
 
+# Optional read replica (tfms_core.replica): reporting pages, staff_list_api and dashboard
+# counters read from it; all writes, and a user's reads for DATABASE_PIN_SECONDS after
+# they write, stay on 'default'. e.g. REPLICA_DATABASE_URL=sqlite:///replica.sqlite3
+DATABASE_ROUTERS = ['tfms_core.replica.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+DATABASE_PIN_SECONDS = int(os.environ.get('DATABASE_PIN_SECONDS', 10))
+if os.environ.get('REPLICA_DATABASE_URL'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = dj_database_url.parse(os.environ['REPLICA_DATABASE_URL'], conn_max_age=600)
+    # Tests use one database; the replica alias reads it through the default connection
+    DATABASES[DATABASE_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+
+# Cache
+# File-based by default, so every worker process on this machine shares reference data
+# (university.cache), counter invalidations, throttle buckets and cached sessions.
+# Workers on several machines need a networked backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://host:6379.
+# LocMemCache is per process: only use it with a single worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},  # Throttle buckets take one entry per client
+    }
+}
+
+# Audit log writer (accounts.audit)
+# Entries are buffered per request and written with one INSERT when the request ends.
+AUDIT_LOG_SYNC = False          # True: write each entry immediately (tests)
+AUDIT_LOG_BUFFER_SIZE = 100     # Outside requests: flush after this many entries...
+AUDIT_LOG_FLUSH_INTERVAL = 5    # ...or this many seconds
+# manage.py archive_audit_logs moves older rows into monthly .jsonl.gz files here
+AUDIT_LOG_RETENTION_DAYS = 90
+AUDIT_LOG_ARCHIVE_DIR = BASE_DIR / 'archive' / 'audit_logs'
+
+# Admin/PSM/Dean dashboard counters (dashboard.counters)
+DASHBOARD_COUNTERS_TTL = 300            # Seconds before counters are recomputed even without writes
+DASHBOARD_COUNTERS_STALE_SECONDS = 30   # How long outdated counters may be served while one request recomputes
+
+# Token-bucket throttles (accounts.throttle), kept in the cache above: scope -> (burst, refill per minute)
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', 'True') == 'True'
+THROTTLE_RATES = {
+    'login_ip': (20, 10),           # Login attempts per client IP
+    'login_username': (5, 2),       # Login attempts per attempted username
+    'api': (120, 120),              # Per user, per API endpoint
+    # 'api:dashboard:staff_list_api': (60, 60),   # Per-endpoint override
+}
+# Reverse proxies in front of the app that append to X-Forwarded-For (0: key per-IP limits on REMOTE_ADDR)
+THROTTLE_TRUSTED_PROXIES = int(os.environ.get('THROTTLE_TRUSTED_PROXIES', 0))
+
+# Bulk staff import (dashboard.staff_import)
+STAFF_IMPORT_HASH_WORKERS = int(os.environ.get('STAFF_IMPORT_HASH_WORKERS', min(4, os.cpu_count() or 1)))  # manage.py import_staff only
+STAFF_IMPORT_WEB_MAX_ROWS = 50          # Accounts one upload may create; the page hashes their passwords in-request
+
+# Request profiler (dashboard.profiling), viewed at /dashboard/admin/profiler/
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'False') == 'True'
+PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', '1.0'))
+PROFILER_BUFFER_SIZE = 500              # Most recent requests kept (in memory, and in the table when persisting)
+PROFILER_PERSIST = os.environ.get('PROFILER_PERSIST', 'False') == 'True'  # Share records across workers via the database
+PROFILER_QUERY_WARNING_THRESHOLD = 50   # Log the SQL of requests running more queries than this
+
 # Auth
 AUTH_USER_MODEL = 'accounts.User'
 LOGIN_URL = 'login'
@@ -147,14 +213,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Session Configuration
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_AGE = 1800  # 30 minutes in seconds (optional safety)
-SESSION_SAVE_EVERY_REQUEST = True
+# The 30-minute idle timeout slides without saving on every request: LowWriteSessionMiddleware
+# saves when the session changes or its last save is older than SESSION_REFRESH_INTERVAL.
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = int(os.environ.get('SESSION_REFRESH_INTERVAL', 60))
+# db by default. cached_db (or cache) takes the per-request SELECT off the database too,
+# but needs a cache shared by every worker (see CACHES) or logouts won't reach the others.
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.db')
 
 # Email Backend
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+# Host/port/TLS can be overridden, e.g. to point run_email_worker at a local SMTP stand-in
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_TIMEOUT = 30
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
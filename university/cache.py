@@ -0,0 +1,81 @@
+"""
+Reference-data cache for tables that change a few times per term
+(WorkloadSettings and Department).
+
+Values are memoized in process memory and in the Django cache under a shared
+version key. university.signals replaces the version on post_save/post_delete,
+so every worker reloads on its next read after a change is committed. That
+needs a cache shared by the workers (the file-based default, or e.g. Redis;
+see CACHES in settings): with LocMemCache only the writing process notices.
+"""
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from .models import Department, WorkloadSettings
+
+VERSION_KEY = 'university:refdata:version'
+# Entries of replaced versions are never read again; let them age out of the cache
+ENTRY_TIMEOUT = 24 * 60 * 60
+_MISSING = object()
+
+_lock = threading.Lock()
+_local = {}  # name -> (version, value)
+_stats = {'hits': 0, 'misses': 0}
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _record(outcome):
+    with _lock:
+        _stats[outcome] += 1
+
+
+def _get(name, loader):
+    version = _current_version()
+
+    entry = _local.get(name)
+    if entry is not None and entry[0] == version:
+        _record('hits')
+        return entry[1]
+
+    key = f'university:refdata:{name}:{version}'
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        _record('misses')
+        value = loader()
+        cache.set(key, value, timeout=ENTRY_TIMEOUT)
+    else:
+        _record('hits')
+
+    _local[name] = (version, value)
+    return value
+
+
+def get_workload_settings():
+    """Returns the WorkloadSettings singleton, or None if it has not been configured."""
+    return _get('workload_settings', WorkloadSettings.objects.first)
+
+
+def get_departments():
+    """Returns all departments as a list, ordered by name."""
+    return _get('departments', lambda: list(Department.objects.order_by('name')))
+
+
+def invalidate():
+    """Replaces the shared version so every process reloads reference data."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    _local.clear()
+
+
+def stats():
+    """Hit/miss counters for this process."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from university.models import TaskForce
+from university.transfer import guess_format, iter_records, write_records
+
+
+class Command(BaseCommand):
+    help = "Export task forces with their departments, weightage, status and members as CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="Output file (default: stdout).")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Output format (default: from the file extension, else csv).")
+        parser.add_argument('--status', action='append', help="Only export task forces in this status. Repeatable.")
+        parser.add_argument('--department', action='append', help="Only export task forces of this department (name). Repeatable.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = guess_format(path, options['format'])
+
+        queryset = TaskForce.objects.all()
+        if options['status']:
+            queryset = queryset.filter(status__in=[s.upper() for s in options['status']])
+        if options['department']:
+            queryset = queryset.filter(departments__name__in=options['department']).distinct()
+
+        try:
+            if path == '-':
+                count = write_records(iter_records(queryset), sys.stdout, fmt)
+            else:
+                with open(path, 'w', newline='', encoding='utf-8') as out:
+                    count = write_records(iter_records(queryset), out, fmt)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {count} task forces."))
@@ -0,0 +1,68 @@
+import csv
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import counters
+from university.models import TaskForce
+from university.transfer import TransferError, guess_format, import_records, read_records
+
+
+class Command(BaseCommand):
+    help = "Create task forces in bulk from a CSV or JSONL file written by export_taskforces."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file ('-' for stdin).")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Input format (default: from the file extension, else csv).")
+        parser.add_argument('--keep-chart-ids', action='store_true', help="Reuse chart ids from the file instead of allocating new ones.")
+        parser.add_argument('--status', choices=[choice for choice, _ in TaskForce.STATUS_CHOICES], help="Set every imported task force to this status (e.g. DRAFT when cloning a term).")
+        parser.add_argument('--year', type=int, help="Year used for new chart ids (default: current year).")
+        parser.add_argument('--skip-members', action='store_true', help="Import task forces without their members.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate every record without creating anything.")
+        parser.add_argument('--actor', help="Username recorded as the actor in the audit log.")
+        parser.add_argument('--report', help="Write rejected records and reasons to this CSV file.")
+
+    def handle(self, *args, **options):
+        actor = None
+        if options['actor']:
+            actor = get_user_model().objects.filter(username=options['actor']).first()
+            if actor is None:
+                raise CommandError(f"No user named '{options['actor']}'.")
+
+        path = options['path']
+        fmt = guess_format(path, options['format'])
+        try:
+            if path == '-':
+                records = read_records(sys.stdin, fmt)
+            else:
+                with open(path, newline='', encoding='utf-8-sig') as f:
+                    records = read_records(f, fmt)
+        except (OSError, TransferError) as e:
+            raise CommandError(str(e))
+
+        created, errors = import_records(
+            records,
+            keep_chart_ids=options['keep_chart_ids'],
+            status=options['status'],
+            year=options['year'],
+            skip_members=options['skip_members'],
+            dry_run=options['dry_run'],
+            actor=actor,
+        )
+
+        if created:
+            counters.invalidate()  # Bulk inserts send no post_save to do it
+
+        for number, message in errors:
+            self.stderr.write(f"Record {number}: {message}")
+        if options['report'] and errors:
+            with open(options['report'], 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Record', 'Error'])
+                writer.writerows(errors)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Dry run: {len(records) - len(errors)} of {len(records)} records are valid, {len(errors)} rejected."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Created {created} task forces, {len(errors)} records rejected."))
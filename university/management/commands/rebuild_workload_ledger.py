@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from university.models import StaffWorkload
+from university.services import WorkloadService
+
+
+class Command(BaseCommand):
+    help = "Recompute the StaffWorkload ledger from task force memberships and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without writing changes.")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        with transaction.atomic():
+            expected = WorkloadService.aggregate_workloads()
+            current = {
+                row[0]: (row[1], row[2])
+                for row in StaffWorkload.objects.select_for_update().values_list('user_id', 'total_weightage', 'active_taskforce_count')
+            }
+
+            to_write = []
+            for user_id, values in expected.items():
+                if current.get(user_id) != values:
+                    to_write.append(StaffWorkload(
+                        user_id=user_id,
+                        total_weightage=values[0],
+                        active_taskforce_count=values[1],
+                        updated_at=timezone.now(),
+                    ))
+            # Users no longer on any counted task force keep a zeroed row.
+            for user_id, values in current.items():
+                if user_id not in expected and values != (0, 0):
+                    to_write.append(StaffWorkload(user_id=user_id, total_weightage=0, active_taskforce_count=0, updated_at=timezone.now()))
+
+            if to_write and not dry_run:
+                StaffWorkload.objects.bulk_create(
+                    to_write,
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=['user'],
+                    update_fields=['total_weightage', 'active_taskforce_count', 'updated_at'],
+                )
+
+        verb = "would be updated" if dry_run else "updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"Workload ledger checked: {len(expected)} staff with workload, {len(to_write)} rows {verb}."
+        ))
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from university.models import TaskForce
+from university.services import RosterService
+
+
+class Command(BaseCommand):
+    help = "Suggest balanced members for every task force that has none (optionally adding them)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--headcount', type=int, default=3, help="Members to suggest per task force (default: 3).")
+        parser.add_argument('--status', action='append', choices=[choice for choice, _ in TaskForce.STATUS_CHOICES],
+                            help="Only fill task forces in this status (repeatable; default: ACTIVE and DRAFT).")
+        parser.add_argument('--department', help="Only fill task forces of this department (name).")
+        parser.add_argument('--apply', action='store_true', help="Add the suggested members instead of only listing them.")
+        parser.add_argument('--actor', help="Username recorded as the actor in the audit log.")
+
+    def handle(self, *args, **options):
+        if options['headcount'] < 1:
+            raise CommandError("--headcount must be at least 1.")
+        actor = None
+        if options['actor']:
+            actor = get_user_model().objects.filter(username=options['actor']).first()
+            if actor is None:
+                raise CommandError(f"No user named '{options['actor']}'.")
+
+        taskforces = TaskForce.objects.filter(status__in=options['status'] or RosterService.FILLABLE_STATUSES)
+        if options['department']:
+            taskforces = taskforces.filter(departments__name=options['department'])
+
+        results = RosterService.suggest_all(options['headcount'], taskforces)
+        names = dict(TaskForce.objects.filter(pk__in=results.keys()).values_list('pk', 'name'))
+        for taskforce_id, result in results.items():
+            picks = ', '.join(f"{s['name']} ({s['current_weightage']}->{s['predicted_weightage']})" for s in result['suggestions'])
+            line = f"{names[taskforce_id]}: {picks or 'no eligible lecturers'}"
+            if result['shortfall']:
+                line += f" [{result['shortfall']} short]"
+            self.stdout.write(line)
+
+        short = sum(1 for result in results.values() if result['shortfall'])
+        if options['apply']:
+            added = RosterService.apply(
+                {taskforce_id: [s['id'] for s in result['suggestions']] for taskforce_id, result in results.items()},
+                actor=actor,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Added {added} members to {len(results)} task forces ({short} not fully staffed)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Suggested rosters for {len(results)} task forces ({short} not fully staffed). Re-run with --apply to add them."))
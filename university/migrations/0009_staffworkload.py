@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_ledger(apps, schema_editor):
+    TaskForce = apps.get_model('university', 'TaskForce')
+    StaffWorkload = apps.get_model('university', 'StaffWorkload')
+    Membership = TaskForce.members.through
+    rows = Membership.objects.filter(
+        taskforce__status__in=['ACTIVE', 'SUBMITTED', 'APPROVED', 'DRAFT']
+    ).values('user_id').annotate(
+        total=models.Sum('taskforce__weightage'),
+        count=models.Count('taskforce_id'),
+    )
+    StaffWorkload.objects.bulk_create([
+        StaffWorkload(user_id=row['user_id'], total_weightage=row['total'] or 0, active_taskforce_count=row['count'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('university', '0008_taskforce_psm_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffWorkload',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_weightage', models.IntegerField(default=0)),
+                ('active_taskforce_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_ledger, migrations.RunPython.noop),
+    ]
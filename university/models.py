@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F, Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce, Greatest, Substr
 from django.conf import settings
+import re
 from datetime import date
 
 class Department(models.Model):
@@ -11,6 +14,74 @@ class Department(models.Model):
     def __str__(self):
         return self.name
 
+class Sequence(models.Model):
+    """
+    Named counter for human-readable ids (e.g. "chart:2026" for TaskForce.chart_id).
+    allocate() increments with a single UPDATE, so concurrent callers never get the same value.
+    Code that writes an id itself (imports, restores) must call advance_to() with it,
+    or allocate() will hand the same value out again later.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.last_value}"
+
+    @classmethod
+    def allocate(cls, name, count=1, seed=None):
+        """
+        Reserves `count` consecutive values and returns the first one.
+        seed: optional callable returning the highest value already in use; only
+        called the first time a sequence is created (to continue legacy numbering).
+        """
+        with transaction.atomic():
+            # The UPDATE takes the row lock, so the read below sees our own increment
+            if not cls.objects.filter(name=name).update(last_value=F('last_value') + count):
+                start = seed() if seed else 0
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(name=name, last_value=start + count)
+                except IntegrityError:
+                    # Another process created it first; take the normal path
+                    cls.objects.filter(name=name).update(last_value=F('last_value') + count)
+            last = cls.objects.filter(name=name).values_list('last_value', flat=True).get()
+        return last - count + 1
+
+    @classmethod
+    def advance_to(cls, name, value, seed=None):
+        """
+        Raises the sequence to at least `value`; never lowers it.
+        seed: as for allocate(), used only if the sequence does not exist yet.
+        """
+        with transaction.atomic():
+            if not cls.objects.filter(name=name).update(last_value=Greatest(F('last_value'), value)):
+                start = max(seed() if seed else 0, value)
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(name=name, last_value=start)
+                except IntegrityError:
+                    cls.objects.filter(name=name).update(last_value=Greatest(F('last_value'), value))
+
+class TaskForceQuerySet(models.QuerySet):
+    # Long free-text columns that list pages never show in full
+    SUMMARY_DEFERRED = ('description', 'rejection_reason', 'psm_adjustment_reason')
+    PREVIEW_LENGTH = 400
+
+    def with_summary(self):
+        """
+        What the task force list pages render, in a fixed number of queries:
+        departments prefetched (name order), `member_count` annotated, and the
+        long text fields deferred. `description_preview` holds the start of the
+        description for truncated display.
+        """
+        members = TaskForce.members.through.objects.filter(taskforce_id=OuterRef('pk')).order_by().values('taskforce_id').annotate(n=Count('pk')).values('n')
+        return self.defer(*self.SUMMARY_DEFERRED).annotate(
+            member_count=Coalesce(Subquery(members), 0),
+            description_preview=Substr('description', 1, self.PREVIEW_LENGTH),
+        ).prefetch_related(
+            Prefetch('departments', queryset=Department.objects.order_by('name'))
+        )
+
 class TaskForce(models.Model):
     STATUS_CHOICES = [
         ('ACTIVE', 'Active'),
@@ -50,20 +121,67 @@ class TaskForce(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskForceQuerySet.as_manager()
+
+    CHART_ID_PATTERN = re.compile(r'^TF-(\d{4})-(\d+)$')
+
     def save(self, *args, **kwargs):
-        if not self.pk and not self.chart_id:
-            year = date.today().year
-            prefix = f"TF-{year}-"
-            last = TaskForce.objects.filter(chart_id__startswith=prefix).order_by('chart_id').last()
-            if last and last.chart_id:
-                try:
-                    last_num = int(last.chart_id.split('-')[-1])
-                except ValueError:
-                    last_num = 0
-            else:
-                last_num = 0
-            self.chart_id = f"{prefix}{last_num + 1:04d}"
-        return super().save(*args, **kwargs)
+        if self.pk or self.chart_id:
+            if not self.pk and self.chart_id:
+                TaskForce.claim_chart_ids([self.chart_id])
+            # post_save (the workload ledger refresh) commits with the row
+            with transaction.atomic(savepoint=False):
+                return super().save(*args, **kwargs)
+
+        self.chart_id = TaskForce.reserve_chart_ids(1)[0]
+        try:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError:
+            if not TaskForce.objects.filter(chart_id=self.chart_id).exists():
+                raise
+            # Someone wrote this id without going through the sequence; catch it up and retry once
+            year = int(self.CHART_ID_PATTERN.match(self.chart_id).group(1))
+            Sequence.advance_to(f"chart:{year}", TaskForce._highest_chart_number(year))
+            self.chart_id = TaskForce.reserve_chart_ids(1, year=year)[0]
+            with transaction.atomic(savepoint=False):
+                return super().save(*args, **kwargs)
+
+    @staticmethod
+    def _highest_chart_number(year):
+        highest = 0
+        for chart_id in TaskForce.objects.filter(chart_id__startswith=f"TF-{year}-").values_list('chart_id', flat=True):
+            try:
+                highest = max(highest, int(chart_id.split('-')[-1]))
+            except ValueError:
+                pass
+        return highest
+
+    @staticmethod
+    def reserve_chart_ids(count, year=None):
+        """
+        Allocates `count` chart ids (TF-YYYY-NNNN) from the per-year sequence in one round trip.
+        Use for bulk creation, where save() is not called.
+        """
+        year = year or date.today().year
+        # The seed runs once per year, when the sequence row is first created
+        first = Sequence.allocate(f"chart:{year}", count, seed=lambda: TaskForce._highest_chart_number(year))
+        return [f"TF-{year}-{n:04d}" for n in range(first, first + count)]
+
+    @staticmethod
+    def claim_chart_ids(chart_ids):
+        """
+        Moves each year's sequence past explicitly chosen chart ids (TF-YYYY-NNNN),
+        so reserve_chart_ids() never hands them out again. Other formats are ignored.
+        """
+        highest = {}
+        for chart_id in chart_ids:
+            match = TaskForce.CHART_ID_PATTERN.match(chart_id or '')
+            if match:
+                year, number = int(match.group(1)), int(match.group(2))
+                highest[year] = max(highest.get(year, 0), number)
+        for year, number in highest.items():
+            Sequence.advance_to(f"chart:{year}", number, seed=lambda: TaskForce._highest_chart_number(year))
     
     def is_fully_staffed(self):
         # Placeholder for complex logic (e.g. min 3 members)
@@ -96,3 +214,17 @@ class WorkloadSettings(models.Model):
         
     class Meta:
         verbose_name_plural = "Workload Settings"
+
+class StaffWorkload(models.Model):
+    """
+    Denormalized per-user workload ledger.
+    Kept current by university.signals whenever memberships or a task force's
+    status/weightage change; `manage.py rebuild_workload_ledger` reconciles it.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='workload')
+    total_weightage = models.IntegerField(default=0)
+    active_taskforce_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.total_weightage}"
@@ -1,42 +1,68 @@
-from .models import TaskForce, WorkloadSettings
-from django.db.models import Sum
-from django.db import models
+import heapq
+
+from .models import TaskForce, StaffWorkload
+from .cache import get_workload_settings
+from django.db.models import Sum, Count, Exists, OuterRef, Q
+from django.db.models.functions import Coalesce
+from django.db import models, transaction
+from django.utils import timezone
 
 class WorkloadService:
+    # Task forces in these states count towards a member's workload.
+    RELEVANT_STATUSES = ['ACTIVE', 'SUBMITTED', 'APPROVED', 'DRAFT']
+
     @staticmethod
     def calculate_workload(user):
         """
-        Calculates the total weightage of ACTIVE or DRAFT task forces directly assigned to the user.
-        Excludes task forces in other states (e.g. inactive, completed concepts).
-        """
-        # We only count ACTIVE and DRAFT task forces for workload
-        # (Assuming DRAFT also counts because HOD is planning with them)
-        # OR: Should we only count ACTIVE? 
-        # Requirement says "Active Task Forces". Let's stick to ACTIVE and SUBMITTED/APPROVED.
-        # Drafts are tricky. Let's include everything that is NOT Inactive or Rejected.
-        
-        relevant_statuses = ['ACTIVE', 'SUBMITTED', 'APPROVED', 'DRAFT']
-        
-        # Calculate as Member
-        member_weightage = TaskForce.objects.filter(
-            members=user,
-            status__in=relevant_statuses
-        ).aggregate(total=Sum('weightage'))['total'] or 0
-        
-        # Calculate as Chairman (If chairman also gets workload points?)
-        # Use Case doesn't explicitly say Chairman gets separate points, but typically they do.
-        # But the TaskForce model links chairman separately. 
-        # If chairman is also in members list, we might double count.
-        # Let's assume Chairman is implicitly a member or explicitly added to members.
-        # For safety, let's just sum up distinct task forces where user is EITHER chairman OR member.
-        
-        task_forces = TaskForce.objects.filter(
-            status__in=relevant_statuses,
-            members=user
-        ).distinct()
-        
-        total_weightage = task_forces.aggregate(total=Sum('weightage'))['total'] or 0
-        return total_weightage
+        Returns the total weightage of ACTIVE, SUBMITTED, APPROVED or DRAFT task forces
+        the user is a member of. Excludes task forces in other states (e.g. inactive, rejected).
+        Reads the StaffWorkload ledger, so this is a primary-key lookup.
+        """
+        # Drafts count because the HOD is planning with them; Inactive and Rejected do not.
+        total = StaffWorkload.objects.filter(user_id=getattr(user, 'pk', user)).values_list('total_weightage', flat=True).first()
+        return total or 0
+
+    @staticmethod
+    def aggregate_workloads(user_ids=None):
+        """
+        Recomputes workload totals from the TaskForce.members join table.
+        Returns a dict of user id -> (total_weightage, active_taskforce_count).
+        Only users with at least one counted membership appear in the result.
+        """
+        Membership = TaskForce.members.through
+        rows = Membership.objects.filter(taskforce__status__in=WorkloadService.RELEVANT_STATUSES)
+        if user_ids is not None:
+            rows = rows.filter(user_id__in=user_ids)
+        rows = rows.values('user_id').annotate(
+            total=Sum('taskforce__weightage'),
+            count=Count('taskforce_id'),
+        ).values_list('user_id', 'total', 'count')
+        return {user_id: (total or 0, count) for user_id, total, count in rows}
+
+    @staticmethod
+    def refresh_ledger(user_ids):
+        """
+        Recomputes the StaffWorkload rows for the given users.
+        Called from university.signals inside the writing transaction.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        totals = WorkloadService.aggregate_workloads(user_ids)
+        StaffWorkload.objects.bulk_create(
+            [
+                StaffWorkload(
+                    user_id=user_id,
+                    total_weightage=totals.get(user_id, (0, 0))[0],
+                    active_taskforce_count=totals.get(user_id, (0, 0))[1],
+                    updated_at=timezone.now(),
+                )
+                for user_id in user_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['total_weightage', 'active_taskforce_count', 'updated_at'],
+        )
 
     @staticmethod
     def get_workload_status(user, additional_weightage=0):
@@ -45,9 +71,100 @@ class WorkloadService:
         additional_weightage: Used to simulate "What if I add this task force?"
         """
         current_weightage = WorkloadService.calculate_workload(user)
+        settings = get_workload_settings()
+        return WorkloadService._build_status(current_weightage, additional_weightage, settings)
+
+    @staticmethod
+    def bulk_workload_status(users, additional_weightage=0):
+        """
+        Batched version of get_workload_status.
+        users: a User queryset, or an iterable of User instances or primary keys.
+        Returns a dict of user id -> status dictionary (same shape as get_workload_status),
+        read from the StaffWorkload ledger in one query.
+        """
+        if isinstance(users, models.QuerySet):
+            user_ids = list(users.values_list('pk', flat=True))
+        else:
+            user_ids = [getattr(user, 'pk', user) for user in users]
+        if not user_ids:
+            return {}
+
+        totals = dict(
+            StaffWorkload.objects.filter(user_id__in=user_ids).values_list('user_id', 'total_weightage')
+        )
+
+        settings = get_workload_settings()
+        return {
+            user_id: WorkloadService._build_status(totals.get(user_id) or 0, additional_weightage, settings)
+            for user_id in user_ids
+        }
+
+    @staticmethod
+    def simulate_roster(taskforce, add_ids=(), remove_ids=(), pool=None, weightage=None):
+        """
+        What-if for a proposed roster change on one task force.
+        add_ids / remove_ids: user ids joining or leaving the current members.
+        pool: optional User queryset of candidates to report on as well.
+        weightage: optional proposed weightage (defaults to the task force's own);
+        ignored while the task force's status is not in RELEVANT_STATUSES.
+
+        Reads every affected user's ledger total and current membership in one
+        query. A current member's ledger total already includes this task force
+        (when its status counts), so that contribution is taken off before the
+        proposed weightage is added back for the proposed roster.
+
+        Returns a dict with 'members' (proposed member ids) and 'staff', a list of
+        {'id', 'name', 'member_before', 'member_after', 'before', 'after'} plus
+        'if_added' for users left off the proposed roster; the statuses have the
+        same shape as get_workload_status.
+        """
+        from accounts.models import User
+
+        add_ids, remove_ids = set(add_ids), set(remove_ids)
+        # A task force whose status isn't counted (REJECTED, INACTIVE) adds nothing to anyone's load
+        is_counted = taskforce.status in WorkloadService.RELEVANT_STATUSES
+        weightage = (taskforce.weightage if weightage is None else weightage) if is_counted else 0
+        counted = taskforce.weightage if is_counted else 0
+
+        Membership = TaskForce.members.through
+        users = User.objects.annotate(
+            ledger_total=Coalesce('workload__total_weightage', 0),
+            is_member=Exists(Membership.objects.filter(taskforce_id=taskforce.pk, user_id=OuterRef('pk'))),
+        )
+        condition = Q(pk__in=add_ids | remove_ids) | Q(is_member=True)
+        if pool is not None:
+            condition |= Q(pk__in=pool.values('pk'))
+        rows = users.filter(condition).order_by('first_name', 'last_name', 'username').values_list(
+            'pk', 'first_name', 'last_name', 'username', 'ledger_total', 'is_member',
+        )
+
+        settings = get_workload_settings()
+        members = []
+        staff = []
+        for user_id, first_name, last_name, username, ledger_total, is_member in rows:
+            member_after = (is_member or user_id in add_ids) and user_id not in remove_ids
+            # Workload without this task force, whatever the roster
+            baseline = ledger_total - (counted if is_member else 0)
+            entry = {
+                'id': user_id,
+                'name': f"{first_name} {last_name}".strip() or username,
+                'member_before': is_member,
+                'member_after': member_after,
+                'before': WorkloadService._build_status(ledger_total, 0, settings),
+                # 'after' is the roster as proposed, so its current total already includes the change
+                'after': WorkloadService._build_status(baseline + (weightage if member_after else 0), 0, settings),
+            }
+            if member_after:
+                members.append(user_id)
+            else:
+                entry['if_added'] = WorkloadService._build_status(baseline, weightage, settings)
+            staff.append(entry)
+        return {'members': members, 'staff': staff}
+
+    @staticmethod
+    def _build_status(current_weightage, additional_weightage, settings):
         predicted_total = current_weightage + additional_weightage
-        
-        settings = WorkloadSettings.objects.first()
+
         if not settings:
             # Fallback if no settings exist
             return {
@@ -96,3 +213,180 @@ class WorkloadService:
                 'min_weightage': min_weightage,
                 'max_weightage': max_weightage
             }
+
+
+class RosterService:
+    """
+    Suggests balanced task force rosters from an in-memory snapshot of lecturer workloads.
+
+    Giving weightage w to a lecturer at load L adds 2wL + w^2 to the sum of squared
+    loads, so for a fixed headcount the workload variance grows least when the
+    lowest-loaded lecturers are picked. Candidates sit in one min-heap per department
+    keyed on load; a pick is a heap pop and the lecturer goes back with the new load.
+    Nobody is picked if the task force would take them over max_weightage.
+    """
+    # Unstaffed task forces in these states are filled by suggest_all()
+    FILLABLE_STATUSES = ['ACTIVE', 'DRAFT']
+
+    @staticmethod
+    def snapshot(department_ids=None):
+        """
+        Active lecturers as {user_id: {'name', 'department_id', 'weightage'}}, from one query
+        joining the StaffWorkload ledger. Restricted to department_ids when given.
+        """
+        from accounts.models import User
+
+        users = User.objects.filter(is_active=True, role=User.Role.LECTURER, department__isnull=False)
+        if department_ids is not None:
+            users = users.filter(department_id__in=department_ids)
+        rows = users.annotate(weightage=Coalesce('workload__total_weightage', 0)).values_list(
+            'pk', 'first_name', 'last_name', 'username', 'department_id', 'weightage',
+        )
+        return {
+            user_id: {
+                'name': f"{first_name} {last_name}".strip() or username,
+                'department_id': department_id,
+                'weightage': weightage,
+            }
+            for user_id, first_name, last_name, username, department_id, weightage in rows
+        }
+
+    @staticmethod
+    def _heaps(snapshot):
+        heaps = {}
+        for user_id, entry in snapshot.items():
+            heaps.setdefault(entry['department_id'], []).append((entry['weightage'], user_id))
+        for heap in heaps.values():
+            heapq.heapify(heap)
+        return heaps
+
+    @staticmethod
+    def _pick(heaps, department_ids, count, weightage, max_weightage, exclude=()):
+        """
+        Pops up to `count` of the lowest-loaded lecturers across the departments' heaps
+        who stay within max_weightage after taking on `weightage`.
+        Returns [(load, user_id, department_id)]; the caller pushes them back.
+        """
+        fronts = [(heaps[dept][0][0], dept) for dept in set(department_ids) if heaps.get(dept)]
+        heapq.heapify(fronts)
+        picked, skipped = [], []
+        while fronts and len(picked) < count:
+            load, dept = heapq.heappop(fronts)
+            if max_weightage is not None and load + weightage > max_weightage:
+                break  # Everyone left is at least this loaded
+            load, user_id = heapq.heappop(heaps[dept])
+            (skipped if user_id in exclude else picked).append((load, user_id, dept))
+            if heaps[dept]:
+                heapq.heappush(fronts, (heaps[dept][0][0], dept))
+        for load, user_id, dept in skipped:
+            heapq.heappush(heaps[dept], (load, user_id))
+        return picked
+
+    @staticmethod
+    def _suggestion(snapshot, load, user_id, weightage, settings):
+        status = WorkloadService._build_status(load, weightage, settings)
+        return {
+            'id': user_id,
+            'name': snapshot[user_id]['name'],
+            'department_id': snapshot[user_id]['department_id'],
+            'current_weightage': load,
+            'predicted_weightage': load + weightage,
+            'status': status['status'],
+        }
+
+    @staticmethod
+    def suggest_roster(taskforce, headcount, department_ids=None, members=None, snapshot=None):
+        """
+        Ranked lecturers to add so the task force reaches `headcount` members.
+        department_ids: candidate departments (default: the task force's).
+        members: the roster to build on (default: the saved members); never suggested.
+        Returns (suggestions, shortfall): suggestion dicts, least loaded first, and how
+        many places could not be filled without overloading someone.
+        """
+        if department_ids is None:
+            department_ids = list(taskforce.departments.values_list('pk', flat=True))
+        if members is None:
+            members = set(taskforce.members.values_list('pk', flat=True))
+        needed = max(headcount - len(members), 0)
+        if not needed:
+            return [], 0
+        if snapshot is None:
+            snapshot = RosterService.snapshot(department_ids)
+
+        settings = get_workload_settings()
+        max_weightage = settings.max_weightage if settings else None
+        heaps = RosterService._heaps(snapshot)
+        picked = RosterService._pick(heaps, department_ids, needed, taskforce.weightage, max_weightage, exclude=set(members))
+        suggestions = [
+            RosterService._suggestion(snapshot, load, user_id, taskforce.weightage, settings)
+            for load, user_id, _ in picked
+        ]
+        return suggestions, needed - len(suggestions)
+
+    @staticmethod
+    def suggest_all(headcount, taskforces=None):
+        """
+        Term-wide mode: proposes a roster for every task force that has no members.
+        taskforces: queryset to consider (default: all in FILLABLE_STATUSES).
+        Heaviest task forces are staffed first, each pick updating the lecturer's load
+        for the ones after it. A fixed number of queries, whatever the size of the term.
+        Returns {taskforce_id: {'suggestions': [...], 'shortfall': n}}.
+        """
+        if taskforces is None:
+            taskforces = TaskForce.objects.filter(status__in=RosterService.FILLABLE_STATUSES)
+        Membership = TaskForce.members.through
+        unstaffed = list(
+            taskforces.filter(~Exists(Membership.objects.filter(taskforce_id=OuterRef('pk'))))
+            .order_by('-weightage', 'pk').values_list('pk', 'weightage')
+        )
+        if not unstaffed:
+            return {}
+
+        departments = {}
+        for taskforce_id, department_id in TaskForce.departments.through.objects.filter(
+            taskforce_id__in=[pk for pk, _ in unstaffed]
+        ).values_list('taskforce_id', 'department_id'):
+            departments.setdefault(taskforce_id, []).append(department_id)
+
+        snapshot = RosterService.snapshot()
+        settings = get_workload_settings()
+        max_weightage = settings.max_weightage if settings else None
+        heaps = RosterService._heaps(snapshot)
+
+        results = {}
+        for taskforce_id, weightage in unstaffed:
+            picked = RosterService._pick(heaps, departments.get(taskforce_id, []), headcount, weightage, max_weightage)
+            suggestions = []
+            for load, user_id, dept in picked:
+                suggestions.append(RosterService._suggestion(snapshot, load, user_id, weightage, settings))
+                snapshot[user_id]['weightage'] = load + weightage
+                heapq.heappush(heaps[dept], (load + weightage, user_id))
+            results[taskforce_id] = {'suggestions': suggestions, 'shortfall': headcount - len(suggestions)}
+        return results
+
+    @staticmethod
+    def apply(assignments, actor=None):
+        """
+        Adds suggested members: {taskforce_id: [user_id, ...]}.
+        One bulk insert in a transaction, then the ledger refresh that signals would have done.
+        Returns the number of memberships created.
+        """
+        from accounts import audit
+
+        Membership = TaskForce.members.through
+        rows = [
+            Membership(taskforce_id=taskforce_id, user_id=user_id)
+            for taskforce_id, user_ids in assignments.items() for user_id in user_ids
+        ]
+        if not rows:
+            return 0
+        with transaction.atomic():
+            Membership.objects.bulk_create(rows, ignore_conflicts=True)
+            # bulk_create sends no m2m_changed signals, so update the ledger here
+            WorkloadService.refresh_ledger({row.user_id for row in rows})
+        audit.record(
+            actor=actor, action="SUGGEST_ROSTERS", target_model="TaskForce", target_id=None,
+            details=f"Added {len(rows)} suggested members to {len(assignments)} task forces",
+        )
+        audit.flush_process_buffer()
+        return len(rows)
@@ -0,0 +1,67 @@
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+from . import cache as refdata
+from .models import TaskForce, Department, WorkloadSettings
+from .services import WorkloadService
+
+# Keep the StaffWorkload ledger in step with memberships, status and weightage.
+# Django sends m2m_changed and the delete signals inside its own transaction, and
+# TaskForce.save() wraps the save and its post_save in one, so the ledger commits
+# (or rolls back) with the write even under autocommit. Queryset update() and bulk
+# operations send no signals: call WorkloadService.refresh_ledger after them.
+
+LEDGER_FIELDS = {'status', 'weightage'}
+
+@receiver(m2m_changed, sender=TaskForce.members.through)
+def refresh_ledger_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.task_force_memberships.add(...) etc: only that user's total changes
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            WorkloadService.refresh_ledger([instance.pk])
+        return
+
+    if action == 'pre_clear':
+        instance._ledger_cleared_ids = list(instance.members.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        WorkloadService.refresh_ledger(getattr(instance, '_ledger_cleared_ids', []))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        WorkloadService.refresh_ledger(pk_set)
+
+@receiver(pre_save, sender=TaskForce)
+def snapshot_workload_fields(sender, instance, update_fields=None, **kwargs):
+    instance._ledger_previous = None
+    # save(update_fields=[...]) without status/weightage can't change the ledger: skip the SELECT
+    if update_fields is not None and not LEDGER_FIELDS & set(update_fields):
+        return
+    if instance.pk:
+        instance._ledger_previous = TaskForce.objects.filter(pk=instance.pk).values_list('status', 'weightage').first()
+
+@receiver(post_save, sender=TaskForce)
+def refresh_ledger_on_taskforce_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_ledger_previous', None)
+    if created or previous is None:
+        return
+    prev_status, prev_weightage = previous
+    was_counted = prev_status in WorkloadService.RELEVANT_STATUSES
+    is_counted = instance.status in WorkloadService.RELEVANT_STATUSES
+    if was_counted != is_counted or (is_counted and prev_weightage != instance.weightage):
+        WorkloadService.refresh_ledger(instance.members.values_list('pk', flat=True))
+
+@receiver(pre_delete, sender=TaskForce)
+def snapshot_members_before_delete(sender, instance, **kwargs):
+    instance._ledger_member_ids = list(instance.members.values_list('pk', flat=True))
+
+@receiver(post_delete, sender=TaskForce)
+def refresh_ledger_on_taskforce_delete(sender, instance, **kwargs):
+    WorkloadService.refresh_ledger(getattr(instance, '_ledger_member_ids', []))
+
+# Reference-data cache: drop the cached copies once the change is committed,
+# so no other process can re-cache the old rows under the new version.
+
+@receiver(post_save, sender=WorkloadSettings)
+@receiver(post_delete, sender=WorkloadSettings)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_reference_data(sender, **kwargs):
+    transaction.on_commit(refdata.invalidate)
@@ -0,0 +1,40 @@
+from django.test import TestCase
+
+from accounts.models import User
+from university.models import StaffWorkload, TaskForce
+
+
+class WorkloadLedgerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = User.objects.create(username='lect1', role=User.Role.LECTURER)
+
+    def setUp(self):
+        self.taskforce = TaskForce.objects.create(name='TF', status='ACTIVE', weightage=3)
+        self.taskforce.members.add(self.lecturer)
+
+    def total(self):
+        return StaffWorkload.objects.get(user=self.lecturer).total_weightage
+
+    def test_membership_and_weightage_changes_update_the_ledger(self):
+        self.assertEqual(self.total(), 3)
+        self.taskforce.weightage = 5
+        self.taskforce.save()
+        self.assertEqual(self.total(), 5)
+        self.taskforce.members.remove(self.lecturer)
+        self.assertEqual(self.total(), 0)
+
+    def test_status_leaving_the_counted_set_drops_the_weightage(self):
+        self.taskforce.status = 'REJECTED'
+        self.taskforce.save(update_fields=['status'])
+        self.assertEqual(self.total(), 0)
+
+    def test_saves_that_cannot_touch_the_ledger_skip_the_snapshot(self):
+        self.taskforce.name = 'Renamed'
+        with self.assertNumQueries(1):  # Just the UPDATE
+            self.taskforce.save(update_fields=['name', 'updated_at'])
+
+    def test_delete_updates_the_ledger(self):
+        self.taskforce.delete()
+        self.assertEqual(self.total(), 0)
@@ -0,0 +1,115 @@
+import io
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from university.models import Department, TaskForce, WorkloadSettings
+from university.transfer import TransferError, import_records, iter_records, read_records, write_records
+
+
+def record(**fields):
+    data = {'name': 'Imported TF', 'departments': ['Computer Science'], 'members': [], 'weightage': '3'}
+    data.update(fields)
+    return data
+
+
+@override_settings(AUDIT_LOG_SYNC=True)
+class ImportRecordsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Department.objects.create(name='Computer Science')
+        cls.lecturer = User.objects.create(username='lect1', role=User.Role.LECTURER, email='lect1@example.com')
+
+    def setUp(self):
+        cache.clear()  # Departments are read through the reference-data cache
+
+    def test_kept_chart_id_is_not_reserved_again_in_the_same_import(self):
+        year = date.today().year
+        created, errors = import_records(
+            [record(name='Kept', chart_id=f'TF-{year}-0001'), record(name='New')],
+            keep_chart_ids=True,
+        )
+        self.assertEqual((created, errors), (2, []))
+        self.assertEqual(
+            set(TaskForce.objects.values_list('chart_id', flat=True)),
+            {f'TF-{year}-0001', f'TF-{year}-0002'},
+        )
+
+    def test_later_saves_skip_kept_chart_ids(self):
+        year = date.today().year
+        import_records([record(chart_id=f'TF-{year}-0005')], keep_chart_ids=True)
+        ids = [TaskForce.objects.create(name=f'Later {i}').chart_id for i in range(5)]
+        self.assertEqual(ids[-1], f'TF-{year}-0010')
+
+    def test_rejected_records_are_reported_and_not_created(self):
+        existing = TaskForce.objects.create(name='Existing')
+        created, errors = import_records([
+            record(name=''),
+            record(status='bogus'),
+            record(weightage=31),  # Above the default 0-30 range
+            record(weightage='many'),
+            record(departments=[]),
+            record(departments=['Nowhere']),
+            record(members=['ghost']),
+            record(chart_id=existing.chart_id),
+            record(name='Good'),
+        ], keep_chart_ids=True)
+        self.assertEqual(created, 1)
+        messages = dict(errors)
+        self.assertEqual(sorted(messages), list(range(1, 9)))
+        self.assertIn('name is required', messages[1])
+        self.assertIn("unknown status 'BOGUS'", messages[2])
+        self.assertIn('weightage', messages[3])
+        self.assertIn('weightage', messages[4])
+        self.assertIn('at least one department', messages[5])
+        self.assertIn('Nowhere', messages[6])
+        self.assertIn('ghost', messages[7])
+        self.assertIn('already exists', messages[8])
+
+    def test_blank_weightage_defaults(self):
+        import_records([record(weightage='')])
+        self.assertEqual(TaskForce.objects.get().weightage, 5)
+
+    def test_weightage_is_checked_against_the_configured_range(self):
+        WorkloadSettings.objects.create(min_weightage=2, max_weightage=10)
+        created, errors = import_records([record(weightage=1), record(weightage=11), record(weightage=10)])
+        self.assertEqual(created, 1)
+        self.assertEqual([number for number, _ in errors], [1, 2])
+        self.assertIn('between 2 and 10', errors[0][1])
+
+    def test_zero_weightage_round_trips(self):
+        # The form allows 0 under the default minimum, so an export must import again
+        tf = TaskForce.objects.create(name='Unweighted', weightage=0)
+        tf.departments.add(Department.objects.get())
+        for fmt in ('csv', 'jsonl'):
+            out = io.StringIO()
+            write_records(iter_records(TaskForce.objects.filter(pk=tf.pk)), out, fmt)
+            records = read_records(io.StringIO(out.getvalue()), fmt)
+            self.assertEqual(import_records(records), (1, []))
+        self.assertEqual(list(TaskForce.objects.exclude(pk=tf.pk).values_list('weightage', flat=True)), [0, 0])
+
+    def test_dry_run_creates_nothing(self):
+        created, errors = import_records([record()], dry_run=True)
+        self.assertEqual((created, errors), (0, []))
+        self.assertFalse(TaskForce.objects.exists())
+
+    def test_csv_round_trip(self):
+        tf = TaskForce.objects.create(name='Round Trip', weightage=4)
+        tf.departments.add(Department.objects.get())
+        tf.members.add(self.lecturer)
+        out = io.StringIO()
+        write_records(iter_records(TaskForce.objects.all()), out, 'csv')
+        TaskForce.objects.all().delete()
+
+        records = read_records(io.StringIO(out.getvalue()), 'csv')
+        self.assertEqual(import_records(records), (1, []))
+        copy = TaskForce.objects.get()
+        self.assertEqual((copy.name, copy.weightage), ('Round Trip', 4))
+        self.assertEqual(list(copy.members.all()), [self.lecturer])
+
+    def test_csv_without_required_columns_is_refused(self):
+        with self.assertRaises(TransferError):
+            read_records(io.StringIO('name,weightage\nX,3\n'), 'csv')
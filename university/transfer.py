@@ -0,0 +1,269 @@
+"""
+Bulk export/import of task forces with their departments and members,
+used by `manage.py export_taskforces` and `manage.py import_taskforces`.
+
+Records carry names instead of primary keys (departments by name, people by
+username) so a file from one term or one database loads into another.
+CSV stores the list fields joined with LIST_SEPARATOR; JSONL stores lists.
+"""
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from accounts import audit
+from .cache import get_departments, get_workload_settings
+from .models import TaskForce
+from .services import WorkloadService
+
+FIELDS = ['chart_id', 'name', 'description', 'status', 'weightage', 'departments', 'members', 'submitted_by', 'assigned_psm']
+LIST_FIELDS = ('departments', 'members')
+LIST_SEPARATOR = '|'
+CHUNK_SIZE = 500
+
+
+class TransferError(Exception):
+    """The file itself cannot be read (bad format, missing columns, ...)."""
+
+
+def guess_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def iter_records(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yields one dict per task force. Departments and members are fetched per
+    chunk straight from the join tables, so each chunk costs three queries.
+    """
+    Departments = TaskForce.departments.through
+    Members = TaskForce.members.through
+    queryset = queryset.order_by('pk').values(
+        'pk', 'chart_id', 'name', 'description', 'status', 'weightage',
+        'submitted_by__username', 'assigned_psm__username',
+    )
+
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not rows:
+            return
+        last_pk = rows[-1]['pk']
+        pks = [row['pk'] for row in rows]
+
+        departments = {}
+        for tf_id, name in Departments.objects.filter(taskforce_id__in=pks).order_by('department__name').values_list('taskforce_id', 'department__name'):
+            departments.setdefault(tf_id, []).append(name)
+        members = {}
+        for tf_id, username in Members.objects.filter(taskforce_id__in=pks).order_by('user__username').values_list('taskforce_id', 'user__username'):
+            members.setdefault(tf_id, []).append(username)
+
+        for row in rows:
+            yield {
+                'chart_id': row['chart_id'] or '',
+                'name': row['name'],
+                'description': row['description'] or '',
+                'status': row['status'],
+                'weightage': row['weightage'],
+                'departments': departments.get(row['pk'], []),
+                'members': members.get(row['pk'], []),
+                'submitted_by': row['submitted_by__username'] or '',
+                'assigned_psm': row['assigned_psm__username'] or '',
+            }
+
+
+def write_records(records, out, fmt):
+    """Writes records to an open text file. Returns the number written."""
+    count = 0
+    if fmt == 'jsonl':
+        for record in records:
+            out.write(json.dumps(record) + '\n')
+            count += 1
+        return count
+
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for record in records:
+        record = dict(record)
+        for field in LIST_FIELDS:
+            record[field] = LIST_SEPARATOR.join(record[field])
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def read_records(fileobj, fmt):
+    """Reads records from an open text file into dicts shaped like iter_records() output."""
+    records = []
+    if fmt == 'jsonl':
+        for number, line in enumerate(fileobj, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise TransferError(f"Line {number} is not valid JSON: {e}")
+            if not isinstance(record, dict):
+                raise TransferError(f"Line {number} is not a JSON object.")
+            records.append(record)
+        return records
+
+    reader = csv.DictReader(fileobj)
+    missing = [f for f in ('name', 'departments') if f not in (reader.fieldnames or [])]
+    if missing:
+        raise TransferError(f"Missing column(s): {', '.join(missing)}. Expected: {', '.join(FIELDS)}.")
+    for row in reader:
+        record = {k: (v or '').strip() for k, v in row.items() if k}
+        for field in LIST_FIELDS:
+            record[field] = [v.strip() for v in record.get(field, '').split(LIST_SEPARATOR) if v.strip()]
+        records.append(record)
+    return records
+
+
+def import_records(records, keep_chart_ids=False, status=None, year=None, skip_members=False, dry_run=False, actor=None):
+    """
+    Validates and creates task forces in chunks of CHUNK_SIZE. Each chunk is one
+    transaction: chart_ids reserved up front, one bulk_create for the task
+    forces and one per join table.
+
+    keep_chart_ids: reuse the chart_id in the file when it is free (restoring a
+    backup); by default every task force gets a new id (cloning a term).
+    status: overrides the status of every imported task force (e.g. 'DRAFT').
+    Returns (created_count, errors) where errors is a list of (record_number, message).
+    """
+    User = get_user_model()
+    valid_statuses = {choice for choice, _ in TaskForce.STATUS_CHOICES}
+    departments = {d.name.lower(): d for d in get_departments()}
+    # Same range as TaskForceForm.clean_weightage, so whatever the app saved imports again
+    settings = get_workload_settings()
+    min_weightage = settings.min_weightage if settings else 0
+    max_weightage = settings.max_weightage if settings else 30
+
+    usernames = set()
+    for record in records:
+        if not skip_members:
+            usernames.update(record.get('members') or [])
+        usernames.update(u for u in (record.get('submitted_by'), record.get('assigned_psm')) if u)
+    users = {}
+    usernames = list(usernames)
+    for i in range(0, len(usernames), CHUNK_SIZE):
+        users.update(User.objects.filter(username__in=usernames[i:i + CHUNK_SIZE]).values_list('username', 'pk'))
+
+    wanted_chart_ids = [r.get('chart_id') for r in records if r.get('chart_id')] if keep_chart_ids else []
+    taken_chart_ids = set()
+    for i in range(0, len(wanted_chart_ids), CHUNK_SIZE):
+        taken_chart_ids.update(TaskForce.objects.filter(chart_id__in=wanted_chart_ids[i:i + CHUNK_SIZE]).values_list('chart_id', flat=True))
+
+    errors = []
+    valid = []
+    for number, record in enumerate(records, start=1):
+        problems = []
+        name = str(record.get('name') or '').strip()
+        if not name:
+            problems.append("name is required")
+
+        record_status = (status or str(record.get('status') or 'ACTIVE')).upper()
+        if record_status not in valid_statuses:
+            problems.append(f"unknown status '{record_status}'")
+
+        try:
+            raw_weightage = record.get('weightage')
+            # Default only when the column is missing or blank; an explicit value is range-checked
+            weightage = 5 if raw_weightage in (None, '') else int(raw_weightage)
+            if not min_weightage <= weightage <= max_weightage:
+                raise ValueError
+        except (TypeError, ValueError):
+            problems.append(
+                f"weightage must be a whole number between {min_weightage} and {max_weightage}, got '{record.get('weightage')}'"
+            )
+            weightage = None
+
+        dept_names = record.get('departments') or []
+        if not dept_names:
+            problems.append("at least one department is required")
+        unknown = [d for d in dept_names if d.lower() not in departments]
+        if unknown:
+            problems.append(f"unknown department(s): {', '.join(unknown)}")
+
+        member_names = [] if skip_members else list(dict.fromkeys(record.get('members') or []))
+        missing = [u for u in member_names if u not in users]
+        for field in ('submitted_by', 'assigned_psm'):
+            if record.get(field) and record[field] not in users:
+                missing.append(record[field])
+        if missing:
+            problems.append(f"unknown user(s): {', '.join(missing)}")
+
+        chart_id = None
+        if keep_chart_ids and record.get('chart_id'):
+            chart_id = record['chart_id']
+            if chart_id in taken_chart_ids:
+                problems.append(f"chart_id {chart_id} already exists")
+            taken_chart_ids.add(chart_id)
+
+        if problems:
+            errors.append((number, '; '.join(problems)))
+            continue
+        valid.append({
+            'chart_id': chart_id,
+            'name': name,
+            'description': record.get('description') or '',
+            'status': record_status,
+            'weightage': weightage,
+            'department_ids': list(dict.fromkeys(departments[d.lower()].pk for d in dept_names)),
+            'member_ids': [users[u] for u in member_names],
+            'submitted_by_id': users.get(record.get('submitted_by')),
+            'assigned_psm_id': users.get(record.get('assigned_psm')),
+        })
+
+    if dry_run or not valid:
+        return 0, errors
+
+    # Kept ids bypass the sequence; move it past them before any chunk reserves new ones
+    TaskForce.claim_chart_ids([data['chart_id'] for data in valid if data['chart_id']])
+
+    Departments = TaskForce.departments.through
+    Members = TaskForce.members.through
+    created = 0
+    for start in range(0, len(valid), CHUNK_SIZE):
+        chunk = valid[start:start + CHUNK_SIZE]
+        needs_id = sum(1 for data in chunk if not data['chart_id'])
+        new_ids = iter(TaskForce.reserve_chart_ids(needs_id, year=year) if needs_id else [])
+        for data in chunk:
+            data['chart_id'] = data['chart_id'] or next(new_ids)
+
+        with transaction.atomic():
+            TaskForce.objects.bulk_create([
+                TaskForce(
+                    chart_id=data['chart_id'],
+                    name=data['name'],
+                    description=data['description'],
+                    status=data['status'],
+                    weightage=data['weightage'],
+                    submitted_by_id=data['submitted_by_id'],
+                    assigned_psm_id=data['assigned_psm_id'],
+                )
+                for data in chunk
+            ])
+            # chart_id is unique, so it maps rows back to their new primary keys on every backend
+            pks = dict(TaskForce.objects.filter(chart_id__in=[d['chart_id'] for d in chunk]).values_list('chart_id', 'pk'))
+
+            Departments.objects.bulk_create([
+                Departments(taskforce_id=pks[data['chart_id']], department_id=dept_id)
+                for data in chunk for dept_id in data['department_ids']
+            ])
+            Members.objects.bulk_create([
+                Members(taskforce_id=pks[data['chart_id']], user_id=user_id)
+                for data in chunk for user_id in data['member_ids']
+            ])
+            # bulk_create sends no m2m_changed signals, so update the ledger here
+            WorkloadService.refresh_ledger({user_id for data in chunk for user_id in data['member_ids']})
+        created += len(chunk)
+
+    audit.record(
+        actor=actor, action="IMPORT_TASKFORCES", target_model="TaskForce", target_id=None,
+        details=f"Imported {created} task forces ({len(errors)} records rejected)",
+    )
+    audit.flush_process_buffer()
+    return created, errors